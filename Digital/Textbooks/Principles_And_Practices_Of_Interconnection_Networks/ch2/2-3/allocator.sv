@@ -73,8 +73,11 @@ module allocator(
 
   initial begin
     rr_ptr = 2'd0;
+`ifndef ALLOCATOR_NO_DUMP
+    // allocator_lanes builds with ALLOCATOR_NO_DUMP, every lane would dump otherwise
     $dumpfile("allocator.vcd");
     $dumpvars(0, allocator);
+`endif
     #1;
   end
 
@@ -0,0 +1,41 @@
+// allocator_lanes.sv
+//
+// LANES independent copies of the allocator, driven through packed buses so a
+// testbench can run LANES trials in one simulation with one bus write and one
+// bus read per cycle.
+//
+// Lane l uses bits [16*l +: 16] of r, packed as {r3, r2, r1, r0},
+// and bits [4*l +: 4] of select and hold. All lanes share clk and thisPort.
+//
+
+module allocator_lanes #(
+    parameter int LANES = 8
+)(
+    input  logic                  clk,
+    input  logic [1:0]            thisPort,
+    input  logic [16*LANES-1:0]   r,
+    output logic [4*LANES-1:0]    select,
+    output logic [LANES-1:0]      shift,
+    output logic [4*LANES-1:0]    hold
+);
+
+  genvar l;
+  generate
+    for (l = 0; l < LANES; l = l + 1) begin : lane
+      allocator u_allocator(
+        .clk      (clk),
+        .thisPort (thisPort),
+        .r0       (r[16*l +: 4]),
+        .r1       (r[16*l + 4 +: 4]),
+        .r2       (r[16*l + 8 +: 4]),
+        .r3       (r[16*l + 12 +: 4]),
+        .select   (select[4*l +: 4]),
+        .shift    (shift[l])
+      );
+
+      // hold is internal to the allocator, expose it for drop detection
+      assign hold[4*l +: 4] = u_allocator.hold;
+    end
+  endgenerate
+
+endmodule
@@ -0,0 +1,323 @@
+# bit_sliced_allocator.py
+#
+# Bit-sliced model of the allocator for large Monte-Carlo fairness studies.
+# Every signal bit is stored as a bit-plane: a NumPy array of uint64 words where
+# bit t % 64 of word t // 64 belongs to trial t. One bitwise operation on a plane
+# therefore evaluates that gate for 64 trials per word.
+#
+# The logic follows the RTL:
+#   round_robin    -> allocator.sv         (rotating priority, rr_ptr advances on every grant)
+#   fixed_priority -> initial_allocator.sv (r0 highest, grants only when no port is held)
+# Traffic matches Traffic_Generator in test_allocator.py: per port, a packet is started with
+# probability packet_generation_frequency when the port is idle, it is a header phit followed by
+# randint(32, 512) // 16 payload phits, and a header for thisPort counts as dropped when
+# another port holds the output. The traffic is bit-sliced too (see Bit_Sliced_Traffic).
+#
+# Usage: python bit_sliced_allocator.py [number_of_trials] [number_of_cycles] [packet_generation_frequency]
+
+import sys
+
+import numpy as np
+
+from sweep import ALLOCATOR_VARIANTS
+
+NUMBER_OF_PORTS = 4
+TRIALS_PER_WORD = 64
+
+
+def pack_planes(bits):
+    # bool array (..., number_of_trials) -> uint64 bit-planes (..., number_of_trials // 64)
+    return np.packbits(bits, axis=-1, bitorder="little").view("<u8")
+
+
+def unpack_planes(planes):
+    # uint64 bit-planes (..., words) -> bool array (..., words * 64)
+    planes = np.ascontiguousarray(planes, dtype="<u8")
+    return np.unpackbits(planes.view(np.uint8), axis=-1, bitorder="little").astype(bool)
+
+
+class Bit_Sliced_Counter:
+    # number_of_bits bit-planes holding one unsigned counter per trial.
+    # add() is a ripple carry increment, two bitwise operations per counter bit.
+
+    def __init__(self, number_of_words, number_of_bits):
+        self.planes = np.zeros((number_of_bits, number_of_words), dtype=np.uint64)
+
+    def add(self, increment):
+        carry = increment
+        for k in range(len(self.planes)):
+            self.planes[k], carry = self.planes[k] ^ carry, self.planes[k] & carry
+        if carry.any():
+            raise OverflowError("Bit sliced counter overflowed")
+
+    def values(self):
+        bits = unpack_planes(self.planes).astype(np.int64)
+        weights = np.left_shift(1, np.arange(len(self.planes), dtype=np.int64))
+        return (bits * weights[:, None]).sum(axis=0)
+
+
+class Bit_Sliced_Allocator:
+    # State and combinational logic of number_of_words * 64 independent allocators.
+
+    def __init__(self, number_of_words, variant="round_robin", this_port=0):
+        if variant not in ALLOCATOR_VARIANTS:
+            raise ValueError(f"Unknown allocator variant: {variant}")
+        self.number_of_words = number_of_words
+        self.variant = variant
+        self.this_port = this_port
+
+        # last[i] and rr_ptr bits, all allocators start idle with rr_ptr = 0
+        self.last = np.zeros((NUMBER_OF_PORTS, number_of_words), dtype=np.uint64)
+        self.rr_ptr0 = np.zeros(number_of_words, dtype=np.uint64)
+        self.rr_ptr1 = np.zeros(number_of_words, dtype=np.uint64)
+
+    def _match_bit(self, plane, this_port_bit):
+        # r[i][b] == thisPort[b], thisPort is the same for every trial
+        return plane if this_port_bit else ~plane
+
+    def _rotate(self, vector, shift_amount_masks, direction):
+        # vector[(k + rr_ptr) % 4] for direction 1, vector[(k - rr_ptr) % 4] for direction -1.
+        # shift_amount_masks[s] selects the trials whose rr_ptr equals s.
+        rotated = []
+        for k in range(NUMBER_OF_PORTS):
+            bit = np.zeros(self.number_of_words, dtype=np.uint64)
+            for s, mask in enumerate(shift_amount_masks):
+                bit |= mask & vector[(k + direction * s) % NUMBER_OF_PORTS]
+            rotated.append(bit)
+        return rotated
+
+    def _round_robin_grant(self, request):
+        p0, p1 = self.rr_ptr0, self.rr_ptr1
+        shift_amount_masks = [~p1 & ~p0, ~p1 & p0, p1 & ~p0, p1 & p0]
+
+        # rotated_req = {request, request} >> rr_ptr
+        rotated_req = self._rotate(request, shift_amount_masks, 1)
+
+        # fixed priority grant on rotated request
+        rotated_grant = [
+            rotated_req[0],
+            rotated_req[1] & ~rotated_req[0],
+            rotated_req[2] & ~rotated_req[1] & ~rotated_req[0],
+            rotated_req[3] & ~rotated_req[2] & ~rotated_req[1] & ~rotated_req[0],
+        ]
+
+        # rotate grant back to original positions
+        return self._rotate(rotated_grant, shift_amount_masks, -1)
+
+    def _fixed_priority_grant(self, request, avail):
+        pass0 = avail & ~request[0]
+        pass1 = pass0 & ~request[1]
+        pass2 = pass1 & ~request[2]
+        return [request[0] & avail, request[1] & pass0, request[2] & pass1, request[3] & pass2]
+
+    def step(self, r):
+        # r[i][b] is the bit-plane of bit b of input r_i.
+        # Evaluates one clock cycle and returns (request, dropped) per port.
+        this_port_bit0 = self.this_port & 1
+        this_port_bit1 = (self.this_port >> 1) & 1
+
+        head = [r[i][3] & r[i][2] for i in range(NUMBER_OF_PORTS)]
+        payload = [r[i][3] & ~r[i][2] for i in range(NUMBER_OF_PORTS)]
+        match = [self._match_bit(r[i][1], this_port_bit1) & self._match_bit(r[i][0], this_port_bit0)
+                 for i in range(NUMBER_OF_PORTS)]
+        request = [head[i] & match[i] for i in range(NUMBER_OF_PORTS)]
+
+        hold = [self.last[i] & payload[i] for i in range(NUMBER_OF_PORTS)]
+        any_hold = hold[0] | hold[1] | hold[2] | hold[3]
+        avail = ~any_hold
+
+        if self.variant == "round_robin":
+            grant = self._round_robin_grant(request)
+        else:
+            grant = self._fixed_priority_grant(request, avail)
+
+        select = [grant[i] | hold[i] for i in range(NUMBER_OF_PORTS)]
+        shift = grant[0] | grant[1] | grant[2] | grant[3]
+
+        # a header for this port is dropped when hold is set for another port
+        # (hold[i] is never set together with a header on port i)
+        dropped = [request[i] & any_hold for i in range(NUMBER_OF_PORTS)]
+
+        # update state
+        for i in range(NUMBER_OF_PORTS):
+            self.last[i] = select[i]
+        if self.variant == "round_robin":
+            # rr_ptr <= rr_ptr + 1 when shift
+            carry = self.rr_ptr0 & shift
+            self.rr_ptr0 = self.rr_ptr0 ^ shift
+            self.rr_ptr1 = self.rr_ptr1 ^ carry
+
+        return request, dropped
+
+
+def less_than_constant(planes, constant):
+    # planes[..., b, :] is bit b of an unsigned number per trial.
+    # Returns the plane of trials whose number is below constant, comparing from the most significant bit.
+    number_of_bits = planes.shape[-2]
+    less = np.zeros(planes.shape[:-2] + planes.shape[-1:], dtype=np.uint64)
+    equal = ~less
+    for b in reversed(range(number_of_bits)):
+        if (constant >> b) & 1:
+            less |= equal & ~planes[..., b, :]
+            equal &= planes[..., b, :]
+        else:
+            equal &= ~planes[..., b, :]
+    return less
+
+
+def add_constant(planes, constant, number_of_bits):
+    # planes[..., b, :] + constant as number_of_bits bit-planes, a ripple carry adder
+    result = np.zeros(planes.shape[:-2] + (number_of_bits,) + planes.shape[-1:], dtype=np.uint64)
+    carry = np.zeros(planes.shape[:-2] + planes.shape[-1:], dtype=np.uint64)
+    for b in range(number_of_bits):
+        bit = planes[..., b, :] if b < planes.shape[-2] else np.zeros_like(carry)
+        if (constant >> b) & 1:
+            result[..., b, :] = ~(bit ^ carry)
+            carry = bit | carry
+        else:
+            result[..., b, :] = bit ^ carry
+            carry = bit & carry
+    return result
+
+
+class Bit_Sliced_Traffic:
+    # Random packet traffic for every trial, generated directly as bit-planes.
+    # Per port, the payload phits left in the packet in flight are a bit-sliced counter,
+    # a port is busy while it is nonzero. The random numbers are drawn as random bit-planes:
+    #   - starting a packet is a Bernoulli coin, COIN_BITS uniform planes compared against
+    #     packet_generation_frequency * 2 ** COIN_BITS, so the frequency is rounded to a
+    #     multiple of 2 ** -COIN_BITS
+    #   - randint(32, 512) // 16 payload phits is (y >> 4) + 2 for y uniform in [0, 481),
+    #     y is drawn as 9 uniform planes and redrawn where it is 481 or more
+    #   - the port field, bits [5:4] of a uniform 6 bit destination, is 2 uniform planes
+    # None of them depend on the traffic state, so they are drawn for several cycles at a time,
+    # about BLOCK_WORDS words per plane so a block stays in cache.
+
+    COIN_BITS = 16
+    LENGTH_BITS = 9
+    LENGTH_VALUES = 481  # randint(32, 512) has 481 values
+    REMAINING_BITS = 6  # up to 512 // 16 = 32 payload phits
+    BLOCK_WORDS = 1 << 14
+
+    def __init__(self, number_of_words, packet_generation_frequency, rng, counter_bits=32):
+        self.number_of_words = number_of_words
+        self.packet_generation_frequency = packet_generation_frequency
+        self.rng = rng
+        self.coin_threshold = min(round(packet_generation_frequency * (1 << self.COIN_BITS)), 1 << self.COIN_BITS)
+        # remaining[i][k] is bit k of the payload phits port i still has to send
+        self.remaining = np.zeros((NUMBER_OF_PORTS, self.REMAINING_BITS, number_of_words), dtype=np.uint64)
+        self.packets_generated = [Bit_Sliced_Counter(number_of_words, counter_bits) for _ in range(NUMBER_OF_PORTS)]
+        self.block_cycles = max(1, self.BLOCK_WORDS // (NUMBER_OF_PORTS * number_of_words))
+        self.block_cycle = self.block_cycles
+
+    def _uniform_planes(self, number_of_bits, number_of_words):
+        # number_of_bits uniform random bit-planes of number_of_words words
+        return self.rng.integers(0, 1 << 64, (number_of_bits, number_of_words), dtype=np.uint64)
+
+    def _draw_block(self):
+        # coins, payload phits and port fields of the next block_cycles cycles, every port and trial
+        shape = (self.block_cycles, NUMBER_OF_PORTS, self.number_of_words)
+        number_of_words = self.block_cycles * NUMBER_OF_PORTS * self.number_of_words
+
+        if self.coin_threshold >= 1 << self.COIN_BITS:
+            self.coins = np.full(shape, ~np.uint64(0))
+        else:
+            self.coins = less_than_constant(self._uniform_planes(self.COIN_BITS, number_of_words), self.coin_threshold).reshape(shape)
+
+        y = self._uniform_planes(self.LENGTH_BITS, number_of_words)
+        rejected = ~less_than_constant(y, self.LENGTH_VALUES)
+        words = np.flatnonzero(rejected)
+        while len(words):
+            if 8 * len(words) > number_of_words:
+                # most words still hold a rejected trial, redraw them all
+                redrawn = self._uniform_planes(self.LENGTH_BITS, number_of_words)
+                y = (y & ~rejected) | (redrawn & rejected)
+                rejected &= ~less_than_constant(redrawn, self.LENGTH_VALUES)
+                words = np.flatnonzero(rejected)
+            else:
+                # redraw only the words that still hold a rejected trial
+                redrawn = self._uniform_planes(self.LENGTH_BITS, len(words))
+                y[:, words] = (y[:, words] & ~rejected[words]) | (redrawn & rejected[words])
+                rejected[words] &= ~less_than_constant(redrawn, self.LENGTH_VALUES)
+                words = words[rejected[words] != 0]
+        payload_phits = add_constant(y[4:], 2, self.REMAINING_BITS).reshape((self.REMAINING_BITS,) + shape)
+        # (cycle, port, bit, word)
+        self.payload_phits = payload_phits.transpose(1, 2, 0, 3)
+
+        self.port_fields = self._uniform_planes(2, number_of_words).reshape((2,) + shape).transpose(1, 2, 0, 3)
+        self.block_cycle = 0
+
+    def next_planes(self):
+        if self.block_cycle == self.block_cycles:
+            self._draw_block()
+        coin = self.coins[self.block_cycle]
+        payload_phits = self.payload_phits[self.block_cycle]
+        port_field = self.port_fields[self.block_cycle]
+        self.block_cycle += 1
+
+        busy = np.bitwise_or.reduce(self.remaining, axis=1)
+        header = ~busy & coin
+        payload = busy
+
+        # remaining -= 1 on busy ports, a ripple borrow through the counter bits,
+        # then idle ports starting a packet load its payload phits (remaining is 0 there)
+        borrow = busy
+        for k in range(self.REMAINING_BITS):
+            self.remaining[:, k], borrow = self.remaining[:, k] ^ borrow, borrow & ~self.remaining[:, k]
+        self.remaining |= payload_phits & header[:, None]
+
+        # r[i][b] is bit b of r_i: {type, port field}, header 11, payload 10, null 00
+        planes = np.empty((NUMBER_OF_PORTS, 4, self.number_of_words), dtype=np.uint64)
+        planes[:, 3] = header | payload
+        planes[:, 2] = header
+        planes[:, :2] = port_field & header[:, None]
+
+        for i in range(NUMBER_OF_PORTS):
+            self.packets_generated[i].add(header[i])
+        return planes
+
+    def packets_generated_values(self):
+        return np.stack([counter.values() for counter in self.packets_generated])
+
+
+def run_trials(number_of_trials, number_of_cycles, packet_generation_frequency,
+               variant="round_robin", this_port=0, seed=0):
+    # Simulates number_of_trials independent trials (rounded up to a multiple of 64).
+    # Returns per port, per trial arrays of dropped packets, headers for this port and generated packets.
+    number_of_words = -(-number_of_trials // TRIALS_PER_WORD)
+
+    counter_bits = max(number_of_cycles.bit_length(), 1)
+    allocator = Bit_Sliced_Allocator(number_of_words, variant, this_port)
+    traffic = Bit_Sliced_Traffic(number_of_words, packet_generation_frequency, np.random.default_rng(seed), counter_bits)
+    dropped_counters = [Bit_Sliced_Counter(number_of_words, counter_bits) for _ in range(NUMBER_OF_PORTS)]
+    request_counters = [Bit_Sliced_Counter(number_of_words, counter_bits) for _ in range(NUMBER_OF_PORTS)]
+
+    for _ in range(number_of_cycles):
+        request, dropped = allocator.step(traffic.next_planes())
+        for i in range(NUMBER_OF_PORTS):
+            dropped_counters[i].add(dropped[i])
+            request_counters[i].add(request[i])
+
+    return {
+        "dropped": np.stack([counter.values() for counter in dropped_counters]),
+        "requests": np.stack([counter.values() for counter in request_counters]),
+        "generated": traffic.packets_generated_values(),
+    }
+
+
+if __name__ == "__main__":
+    number_of_trials = int(sys.argv[1]) if len(sys.argv) > 1 else 4096
+    number_of_cycles = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    packet_generation_frequency = float(sys.argv[3]) if len(sys.argv) > 3 else 1.0
+
+    for variant in ALLOCATOR_VARIANTS:
+        results = run_trials(number_of_trials, number_of_cycles, packet_generation_frequency, variant)
+        dropped = results["dropped"]
+        print(f"\n{variant}: {dropped.shape[1]} trials of {number_of_cycles} cycles at frequency {packet_generation_frequency}")
+        generated = results["generated"]
+        for port in range(NUMBER_OF_PORTS):
+            print(f"Average {port} Packets Dropped: {dropped[port].mean()} (std {dropped[port].std()})")
+        # drop rate as in the sweep: dropped packets / generated packets
+        print(f"Drop Rate: {dropped.sum() / generated.sum()}")
+        drop_rates = dropped.sum(axis=1) / generated.sum(axis=1)
+        print(f"Standard Deviation of per port drop rates: {drop_rates.std(ddof=1)}")
@@ -2,70 +2,77 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import scipy
 
+from figure_pipeline import DATA_DIR, Figure_Target, build
+
 # file names
-fairness_file = "fairness_random_traffic_results_constant_packet_gen_frequency.csv"
-random_file = "random_traffic_results_constant_packet_gen_frequency.csv"
+fairness_file = DATA_DIR / "fairness_random_traffic_results_constant_packet_gen_frequency.csv"
+random_file = DATA_DIR / "random_traffic_results_constant_packet_gen_frequency.csv"
 
 # figure save path
-save_path = "fairness_comparison/"
+save_path = DATA_DIR / "fairness_comparison"
 
-# read in data
-fairness_df = pd.read_csv(fairness_file)
-random_df = pd.read_csv(random_file)
+PORT_COLUMNS = ["Average 0 Packets Dropped", "Average 1 Packets Dropped", "Average 2 Packets Dropped", "Average 3 Packets Dropped"]
+PORT_COLORS = ['orange', 'blue', 'green', 'red']
 
-# grab data from 1000 - 5000 cycles
-fairness_df = fairness_df[(fairness_df["Number of Cycles"] >= 1000) & (fairness_df["Number of Cycles"] <= 5000)]
-random_df = random_df[(random_df["Number of Cycles"] >= 1000) & (random_df["Number of Cycles"] <= 5000)]
+def _cycles_1000_to_5000(df):
+    # grab data from 1000 - 5000 cycles
+    return df[(df["Number of Cycles"] >= 1000) & (df["Number of Cycles"] <= 5000)]
 
-# plot all port average dropped packets against number of cycles
-plt.figure(figsize=(10, 6))
-plt.plot(fairness_df["Number of Cycles"], fairness_df["Average 0 Packets Dropped"], marker='o', linestyle='-', color='orange', label='Fairness Port 0')
-plt.plot(fairness_df["Number of Cycles"], fairness_df["Average 1 Packets Dropped"], marker='o', linestyle='-', color='blue', label='Fairness Port 1')
-plt.plot(fairness_df["Number of Cycles"], fairness_df["Average 2 Packets Dropped"], marker='o', linestyle='-', color='green', label='Fairness Port 2')
-plt.plot(fairness_df["Number of Cycles"], fairness_df["Average 3 Packets Dropped"], marker='o', linestyle='-', color='red', label='Fairness Port 3')
-plt.plot(random_df["Number of Cycles"], random_df["Average 0 Packets Dropped"], marker='x', linestyle='--', color='orange', label='Random Port 0')
-plt.plot(random_df["Number of Cycles"], random_df["Average 1 Packets Dropped"], marker='x', linestyle='--', color='blue', label='Random Port 1')
-plt.plot(random_df["Number of Cycles"], random_df["Average 2 Packets Dropped"], marker='x', linestyle='--', color='green', label='Random Port 2')
-plt.plot(random_df["Number of Cycles"], random_df["Average 3 Packets Dropped"], marker='x', linestyle='--', color='red', label='Random Port 3')
-plt.title("Average Dropped Packets per Port vs Number of Cycles", fontsize=20)
-plt.xlabel("Number of Cycles", fontsize=16)
-plt.ylabel("Average Dropped Packets per Port", fontsize=16)
-plt.grid()
-plt.legend()
-plt.savefig(save_path + "average_dropped_packets_per_port_vs_cycles_comparison.png")
-plt.show()
+def _port_fits(df):
+    # train linear line of best fit for each port
+    return [scipy.stats.linregress(df["Number of Cycles"], df[column]) for column in PORT_COLUMNS]
 
-# train linear line of best fit for each port from both files
-slope_fairness0, intercept_fairness0, r_value_fairness0, p_value_fairness0, std_err_fairness0 = scipy.stats.linregress(fairness_df["Number of Cycles"], fairness_df["Average 0 Packets Dropped"])
-slope_fairness1, intercept_fairness1, r_value_fairness1, p_value_fairness1, std_err_fairness1 = scipy.stats.linregress(fairness_df["Number of Cycles"], fairness_df["Average 1 Packets Dropped"])
-slope_fairness2, intercept_fairness2, r_value_fairness2, p_value_fairness2, std_err_fairness2 = scipy.stats.linregress(fairness_df["Number of Cycles"], fairness_df["Average 2 Packets Dropped"])
-slope_fairness3, intercept_fairness3, r_value_fairness3, p_value_fairness3, std_err_fairness3 = scipy.stats.linregress(fairness_df["Number of Cycles"], fairness_df["Average 3 Packets Dropped"])
-slope_random0, intercept_random0, r_value_random0, p_value_random0, std_err_random0 = scipy.stats.linregress(random_df["Number of Cycles"], random_df["Average 0 Packets Dropped"])
-slope_random1, intercept_random1, r_value_random1, p_value_random1, std_err_random1 = scipy.stats.linregress(random_df["Number of Cycles"], random_df["Average 1 Packets Dropped"])
-slope_random2, intercept_random2, r_value_random2, p_value_random2, std_err_random2 = scipy.stats.linregress(random_df["Number of Cycles"], random_df["Average 2 Packets Dropped"])
-slope_random3, intercept_random3, r_value_random3, p_value_random3, std_err_random3 = scipy.stats.linregress(random_df["Number of Cycles"], random_df["Average 3 Packets Dropped"])
+# plot all port average dropped packets against number of cycles
+def plot_average_dropped_packets_per_port_vs_cycles_comparison(frames):
+    fairness_df = _cycles_1000_to_5000(frames[fairness_file])
+    random_df = _cycles_1000_to_5000(frames[random_file])
+    for port, (column, color) in enumerate(zip(PORT_COLUMNS, PORT_COLORS)):
+        plt.plot(fairness_df["Number of Cycles"], fairness_df[column], marker='o', linestyle='-', color=color, label=f'Fairness Port {port}')
+    for port, (column, color) in enumerate(zip(PORT_COLUMNS, PORT_COLORS)):
+        plt.plot(random_df["Number of Cycles"], random_df[column], marker='x', linestyle='--', color=color, label=f'Random Port {port}')
+    plt.title("Average Dropped Packets per Port vs Number of Cycles", fontsize=20)
+    plt.xlabel("Number of Cycles", fontsize=16)
+    plt.ylabel("Average Dropped Packets per Port", fontsize=16)
+    plt.grid()
+    plt.legend()
 
 # plot the linear lines of best fit
-plt.figure(figsize=(10, 6))
-x_values = range(1000, 5001, 100)
-plt.plot(x_values, [slope_fairness0 * x + intercept_fairness0 for x in x_values], linestyle='-', color='orange', label='Fairness Port 0 Fit')
-plt.plot(x_values, [slope_fairness1 * x + intercept_fairness1 for x in x_values], linestyle='-', color='blue', label='Fairness Port 1 Fit')
-plt.plot(x_values, [slope_fairness2 * x + intercept_fairness2 for x in x_values], linestyle='-', color='green', label='Fairness Port 2 Fit')
-plt.plot(x_values, [slope_fairness3 * x + intercept_fairness3 for x in x_values], linestyle='-', color='red', label='Fairness Port 3 Fit')
-plt.plot(x_values, [slope_random0 * x + intercept_random0 for x in x_values], linestyle='--', color='orange', label='Random Port 0 Fit')
-plt.plot(x_values, [slope_random1 * x + intercept_random1 for x in x_values], linestyle='--', color='blue', label='Random Port 1 Fit')
-plt.plot(x_values, [slope_random2 * x + intercept_random2 for x in x_values], linestyle='--', color='green', label='Random Port 2 Fit')
-plt.plot(x_values, [slope_random3 * x + intercept_random3 for x in x_values], linestyle='--', color='red', label='Random Port 3 Fit')
-plt.title("Linear Fit of Average Dropped Packets per Port vs Number of Cycles", fontsize=20)
-plt.xlabel("Number of Cycles", fontsize=16)
-plt.ylabel("Average Dropped Packets per Port", fontsize=16)
-plt.grid()
-plt.legend()
-plt.savefig(save_path + "linear_fit_average_dropped_packets_per_port_vs_cycles_comparison.png")
-plt.show()
+def plot_linear_fit_average_dropped_packets_per_port_vs_cycles_comparison(frames):
+    fairness_fits = _port_fits(_cycles_1000_to_5000(frames[fairness_file]))
+    random_fits = _port_fits(_cycles_1000_to_5000(frames[random_file]))
+    x_values = range(1000, 5001, 100)
+    for port, (fit, color) in enumerate(zip(fairness_fits, PORT_COLORS)):
+        plt.plot(x_values, [fit.slope * x + fit.intercept for x in x_values], linestyle='-', color=color, label=f'Fairness Port {port} Fit')
+    for port, (fit, color) in enumerate(zip(random_fits, PORT_COLORS)):
+        plt.plot(x_values, [fit.slope * x + fit.intercept for x in x_values], linestyle='--', color=color, label=f'Random Port {port} Fit')
+    plt.title("Linear Fit of Average Dropped Packets per Port vs Number of Cycles", fontsize=20)
+    plt.xlabel("Number of Cycles", fontsize=16)
+    plt.ylabel("Average Dropped Packets per Port", fontsize=16)
+    plt.grid()
+    plt.legend()
+
+TARGETS = [
+    Figure_Target(
+        save_path / "average_dropped_packets_per_port_vs_cycles_comparison.png",
+        {fairness_file: ["Number of Cycles"] + PORT_COLUMNS, random_file: ["Number of Cycles"] + PORT_COLUMNS},
+        plot_average_dropped_packets_per_port_vs_cycles_comparison,
+    ),
+    Figure_Target(
+        save_path / "linear_fit_average_dropped_packets_per_port_vs_cycles_comparison.png",
+        {fairness_file: ["Number of Cycles"] + PORT_COLUMNS, random_file: ["Number of Cycles"] + PORT_COLUMNS},
+        plot_linear_fit_average_dropped_packets_per_port_vs_cycles_comparison,
+    ),
+]
+
+def print_slope_standard_deviations():
+    # print standard deviation of slopes for fairness and random
+    fairness_fits = _port_fits(_cycles_1000_to_5000(pd.read_csv(fairness_file)))
+    random_fits = _port_fits(_cycles_1000_to_5000(pd.read_csv(random_file)))
+    standard_deviation_fairness = scipy.stats.tstd([fit.slope for fit in fairness_fits])
+    standard_deviation_random = scipy.stats.tstd([fit.slope for fit in random_fits])
+    print(f"Standard Deviation of Fairness Slopes: {standard_deviation_fairness}")
+    print(f"Standard Deviation of Random Slopes: {standard_deviation_random}")
 
-# print standard deviation of slopes for fairness and random
-standard_deviation_fairness = scipy.stats.tstd([slope_fairness0, slope_fairness1, slope_fairness2, slope_fairness3])
-standard_deviation_random = scipy.stats.tstd([slope_random0, slope_random1, slope_random2, slope_random3])
-print(f"Standard Deviation of Fairness Slopes: {standard_deviation_fairness}")
-print(f"Standard Deviation of Random Slopes: {standard_deviation_random}")
+if __name__ == "__main__":
+    build(TARGETS)
+    print_slope_standard_deviations()
@@ -0,0 +1,180 @@
+# figure_pipeline.py
+#
+# Headless, incremental figure rendering for the sweep CSVs.
+# Each figure is declared as a Figure_Target that depends on specific columns
+# of specific CSV files. A target is only re-rendered when the content hash of
+# those columns, of the module defining its render function (helpers and constants
+# included) or of its extra source dependencies changes, or its PNG is missing.
+# Stale targets are rendered in a process pool and written atomically.
+
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import matplotlib
+matplotlib.use("Agg")  # never open windows, rendering happens in worker processes
+import matplotlib.pyplot as plt
+import pandas as pd
+
+DATA_DIR = Path(__file__).resolve().parent
+DEFAULT_CACHE_PATH = DATA_DIR / ".figure_cache.json"
+
+
+class Figure_Target:
+    # A single PNG output.
+    # inputs maps a CSV path to the list of columns the figure reads from it.
+    # render is a module level function (so it can be sent to a worker process)
+    # that receives a dict of csv path -> DataFrame holding only those columns,
+    # and draws on the current pyplot figure.
+    # depends_on lists extra source files the render function uses from other modules.
+
+    def __init__(self, output, inputs, render, figsize=(10, 6), depends_on=()):
+        self.output = Path(output)
+        self.inputs = {Path(csv_file): list(columns) for csv_file, columns in inputs.items()}
+        self.render = render
+        self.figsize = figsize
+        self.depends_on = [Path(source_file) for source_file in depends_on]
+
+    def input_hash(self, frames):
+        # hash of the declared columns plus the source of the whole module defining
+        # the render function, so editing a plot, a helper or a constant invalidates it
+        digest = hashlib.sha256()
+        digest.update(inspect.getsource(inspect.getmodule(self.render)).encode())
+        for source_file in sorted(self.depends_on):
+            digest.update(source_file.read_bytes())
+        digest.update(repr(self.figsize).encode())
+        for csv_file in sorted(self.inputs):
+            digest.update(str(csv_file).encode())
+            digest.update(frames[csv_file].to_csv(index=False).encode())
+        return digest.hexdigest()
+
+    def __str__(self):
+        return str(self.output)
+
+
+def _atomic_write_text(path, text):
+    # write to a temporary file in the same directory, then rename over the target
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _load_cache(cache_path):
+    try:
+        with open(cache_path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _render_target(target, frames):
+    # runs in a worker process
+    target.output.parent.mkdir(parents=True, exist_ok=True)
+    fig = plt.figure(figsize=target.figsize)
+    fd, tmp_path = tempfile.mkstemp(dir=target.output.parent, prefix=target.output.stem, suffix=".tmp")
+    os.close(fd)
+    try:
+        target.render(frames)
+        fig.savefig(tmp_path, format="png")
+        os.replace(tmp_path, target.output)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    finally:
+        plt.close(fig)
+    return str(target.output)
+
+
+def build(targets, cache_path=DEFAULT_CACHE_PATH, workers=None, force=False, log=True):
+    # Render every target whose inputs changed since the last build.
+    # Returns the list of outputs that were rendered.
+    outputs = [target.output.resolve() for target in targets]
+    if len(set(outputs)) != len(outputs):
+        duplicates = sorted({str(output) for output in outputs if outputs.count(output) > 1})
+        raise ValueError(f"Multiple targets write the same output: {duplicates}")
+
+    # targets whose CSVs have not been produced yet (e.g. a sweep that was never run) are skipped
+    missing = [target for target in targets if not all(csv_file.exists() for csv_file in target.inputs)]
+    if missing and log:
+        for target in missing:
+            print(f"skipped {target}, missing input")
+    targets = [target for target in targets if target not in missing]
+
+    # read each CSV once, only the columns some target depends on
+    columns_per_file = {}
+    for target in targets:
+        for csv_file, columns in target.inputs.items():
+            columns_per_file.setdefault(csv_file, set()).update(columns)
+    tables = {
+        csv_file: pd.read_csv(csv_file, usecols=sorted(columns))
+        for csv_file, columns in columns_per_file.items()
+    }
+
+    cache = _load_cache(cache_path)
+    cache_dir = Path(cache_path).resolve().parent
+    stale = []
+    for target in targets:
+        frames = {csv_file: tables[csv_file][columns] for csv_file, columns in target.inputs.items()}
+        key = os.path.relpath(target.output.resolve(), cache_dir)
+        digest = target.input_hash(frames)
+        if force or cache.get(key) != digest or not target.output.exists():
+            stale.append((target, frames, key, digest))
+
+    if log:
+        print(f"{len(stale)} of {len(targets)} figures out of date")
+
+    rendered = []
+    try:
+        if len(stale) > 1 and workers != 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(_render_target, target, frames): (target, key, digest)
+                           for target, frames, key, digest in stale}
+                # record every figure that rendered before re-raising the first failure
+                first_error = None
+                for future in as_completed(futures):
+                    target, key, digest = futures[future]
+                    error = future.exception()
+                    if error is not None:
+                        if log:
+                            print(f"failed {target}: {error!r}")
+                        first_error = first_error or error
+                        continue
+                    cache[key] = digest
+                    rendered.append(str(target.output))
+                    if log:
+                        print(f"rendered {target}")
+                if first_error is not None:
+                    raise first_error
+        else:
+            first_error = None
+            for target, frames, key, digest in stale:
+                try:
+                    _render_target(target, frames)
+                except Exception as error:
+                    if log:
+                        print(f"failed {target}: {error!r}")
+                    first_error = first_error or error
+                    continue
+                cache[key] = digest
+                rendered.append(str(target.output))
+                if log:
+                    print(f"rendered {target}")
+            if first_error is not None:
+                raise first_error
+    finally:
+        # keep the figures that did render, even if another one failed
+        if rendered:
+            _atomic_write_text(cache_path, json.dumps(cache, indent=2, sort_keys=True))
+
+    return rendered
@@ -0,0 +1,29 @@
+# report.py
+#
+# Regenerates every figure of the 2-3 report in one build.
+# Only figures whose CSV columns changed since the last run are re-rendered.
+# Usage: python report.py [--force] [--workers N]
+
+import argparse
+
+from figure_pipeline import build
+import fairness_visualization
+import visualize_data_vary_cycles
+import visualize_data_vary_packet_gen_frequency
+import visualize_sweep
+
+TARGETS = (
+    visualize_data_vary_cycles.TARGETS
+    + visualize_data_vary_packet_gen_frequency.TARGETS
+    + fairness_visualization.TARGETS
+    + visualize_sweep.TARGETS
+)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render the allocator sweep figures.")
+    parser.add_argument("--force", action="store_true", help="re-render every figure")
+    parser.add_argument("--workers", type=int, default=None, help="size of the render process pool")
+    args = parser.parse_args()
+
+    build(TARGETS, workers=args.workers, force=args.force)
+    fairness_visualization.print_slope_standard_deviations()
@@ -0,0 +1,69 @@
+# test_figure_pipeline.py
+#
+# pytest checks of the incremental figure build on throwaway CSVs.
+
+import matplotlib.pyplot as plt
+import pandas as pd
+import pytest
+
+from figure_pipeline import Figure_Target, build
+
+
+def plot_first_column(frames):
+    for df in frames.values():
+        plt.plot(df.iloc[:, 0])
+
+
+def fail_to_render(frames):
+    raise RuntimeError("render failed")
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "results.csv"
+    pd.DataFrame({"a": [1, 2, 3], "b": [4, 5, 6], "unused": [7, 8, 9]}).to_csv(path, index=False)
+    return path
+
+
+def make_targets(tmp_path, csv_file, render_b=plot_first_column):
+    return [
+        Figure_Target(tmp_path / "a.png", {csv_file: ["a"]}, plot_first_column),
+        Figure_Target(tmp_path / "b.png", {csv_file: ["b"]}, render_b),
+    ]
+
+
+def set_column(csv_file, column, values):
+    df = pd.read_csv(csv_file)
+    df[column] = values
+    df.to_csv(csv_file, index=False)
+
+
+def test_second_build_renders_nothing(tmp_path, csv_file):
+    cache_path = tmp_path / "cache.json"
+    targets = make_targets(tmp_path, csv_file)
+    assert len(build(targets, cache_path, workers=1, log=False)) == 2
+    assert build(targets, cache_path, workers=1, log=False) == []
+
+
+def test_only_declared_columns_invalidate(tmp_path, csv_file):
+    cache_path = tmp_path / "cache.json"
+    targets = make_targets(tmp_path, csv_file)
+    build(targets, cache_path, workers=1, log=False)
+
+    set_column(csv_file, "unused", [0, 0, 0])
+    assert build(targets, cache_path, workers=1, log=False) == []
+
+    set_column(csv_file, "b", [0, 0, 0])
+    assert build(targets, cache_path, workers=1, log=False) == [str(tmp_path / "b.png")]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_failed_target_keeps_the_others_cached(tmp_path, csv_file, workers):
+    cache_path = tmp_path / "cache.json"
+    with pytest.raises(RuntimeError, match="render failed"):
+        build(make_targets(tmp_path, csv_file, render_b=fail_to_render), cache_path, workers=workers, log=False)
+    assert (tmp_path / "a.png").exists()
+    assert not (tmp_path / "b.png").exists()
+
+    # a.png is cached, only the failed target renders once it is fixed
+    assert build(make_targets(tmp_path, csv_file), cache_path, workers=workers, log=False) == [str(tmp_path / "b.png")]
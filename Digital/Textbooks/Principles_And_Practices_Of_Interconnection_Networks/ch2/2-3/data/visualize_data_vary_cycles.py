@@ -1,84 +1,120 @@
 import matplotlib.pyplot as plt
-import pandas as pd
+
+from figure_pipeline import DATA_DIR, Figure_Target, build
 
 # read in random_traffic_results.csv
-df = pd.read_csv("fairness_random_traffic_results_constant_packet_gen_frequency.csv")
+data_file = DATA_DIR / "fairness_random_traffic_results_constant_packet_gen_frequency.csv"
 
 # plot average dropped packets against total packets generated
-plt.figure(figsize=(10, 6))
-plt.plot(df["Total Packets Generated"], df["Average Dropped Packets"], marker='o', linestyle='-', color='m')
-plt.title("Average Dropped Packets vs Total Packets Generated (Constant Packet Generation Frequency)", fontsize=20)
-plt.xlabel("Total Packets Generated", fontsize=16)
-plt.ylabel("Average Dropped Packets", fontsize=16)
-plt.grid()
-plt.savefig("average_dropped_packets_vs_total_packets_generated.png")
-plt.show()
+def plot_average_dropped_packets_vs_total_packets_generated(frames):
+    df = frames[data_file]
+    plt.plot(df["Total Packets Generated"], df["Average Dropped Packets"], marker='o', linestyle='-', color='m')
+    plt.title("Average Dropped Packets vs Total Packets Generated (Constant Packet Generation Frequency)", fontsize=20)
+    plt.xlabel("Total Packets Generated", fontsize=16)
+    plt.ylabel("Average Dropped Packets", fontsize=16)
+    plt.grid()
 
 ######################## Cycle variance only ##########################################
 # Plot the average number of dropped packets against the number of cycles
-plt.figure(figsize=(10, 6))
-plt.plot(df["Number of Cycles"], df["Average Dropped Packets"], marker='o', linestyle='-', color='b')
-plt.title("Average Dropped Packets vs Number of Cycles", fontsize=20)
-plt.xlabel("Number of Cycles", fontsize=16)
-plt.ylabel("Average Dropped Packets", fontsize=16)
-plt.grid()
-plt.savefig("average_dropped_packets_vs_cycles.png")
-plt.show()
+def plot_average_dropped_packets_vs_cycles(frames):
+    df = frames[data_file]
+    plt.plot(df["Number of Cycles"], df["Average Dropped Packets"], marker='o', linestyle='-', color='b')
+    plt.title("Average Dropped Packets vs Number of Cycles", fontsize=20)
+    plt.xlabel("Number of Cycles", fontsize=16)
+    plt.ylabel("Average Dropped Packets", fontsize=16)
+    plt.grid()
 
 # plot the ratio of dropped packets against the number of cycles
-plt.figure(figsize=(10, 6))
-plt.plot(df["Number of Cycles"], df["Ratio of Dropped Packets to Total Cycles"], marker='o', linestyle='-', color='r')
-plt.title("Ratio of Dropped Packets vs Number of Cycles", fontsize=20)
-plt.xlabel("Number of Cycles", fontsize=16)
-plt.ylabel("Ratio of Dropped Packets", fontsize=16)
-plt.grid()
-plt.savefig("ratio_dropped_packets_vs_cycles.png")
-plt.show()
+def plot_ratio_dropped_packets_vs_cycles(frames):
+    df = frames[data_file]
+    plt.plot(df["Number of Cycles"], df["Ratio of Dropped Packets to Total Cycles"], marker='o', linestyle='-', color='r')
+    plt.title("Ratio of Dropped Packets vs Number of Cycles", fontsize=20)
+    plt.xlabel("Number of Cycles", fontsize=16)
+    plt.ylabel("Ratio of Dropped Packets", fontsize=16)
+    plt.grid()
 
 # plot total packets generated against number of cycles
-plt.figure(figsize=(10, 6))
-plt.plot(df["Number of Cycles"], df["Total Packets Generated"], marker='o', linestyle='-', color='g')
-plt.title("Total Packets Generated vs Number of Cycles", fontsize=20)
-plt.xlabel("Number of Cycles", fontsize=16)
-plt.ylabel("Total Packets Generated", fontsize=16)
-plt.grid()
-plt.savefig("total_packets_generated_vs_cycles.png")
-plt.show()
+def plot_total_packets_generated_vs_cycles(frames):
+    df = frames[data_file]
+    plt.plot(df["Number of Cycles"], df["Total Packets Generated"], marker='o', linestyle='-', color='g')
+    plt.title("Total Packets Generated vs Number of Cycles", fontsize=20)
+    plt.xlabel("Number of Cycles", fontsize=16)
+    plt.ylabel("Total Packets Generated", fontsize=16)
+    plt.grid()
 
 # plot average dropped packets per port against number of cycles
-plt.figure(figsize=(10, 6))
-# Plot all 4 ports
-plt.plot(df["Number of Cycles"], df["Average 0 Packets Dropped"], marker='o', linestyle='-', color='orange', label='Port 0')
-plt.plot(df["Number of Cycles"], df["Average 1 Packets Dropped"], marker='o', linestyle='-', color='blue', label='Port 1')
-plt.plot(df["Number of Cycles"], df["Average 2 Packets Dropped"], marker='o', linestyle='-', color='green', label='Port 2')
-plt.plot(df["Number of Cycles"], df["Average 3 Packets Dropped"], marker='o', linestyle='-', color='red', label='Port 3')
-plt.title("Average Dropped Packets per Port vs Number of Cycles", fontsize=20)
-plt.xlabel("Number of Cycles", fontsize=16)
-plt.ylabel("Average Dropped Packets per Port", fontsize=16)
-plt.grid()
-plt.legend()
-plt.savefig("average_dropped_packets_per_port_vs_cycles.png")
-plt.show()
+def plot_average_dropped_packets_per_port_vs_cycles(frames):
+    df = frames[data_file]
+    # Plot all 4 ports
+    plt.plot(df["Number of Cycles"], df["Average 0 Packets Dropped"], marker='o', linestyle='-', color='orange', label='Port 0')
+    plt.plot(df["Number of Cycles"], df["Average 1 Packets Dropped"], marker='o', linestyle='-', color='blue', label='Port 1')
+    plt.plot(df["Number of Cycles"], df["Average 2 Packets Dropped"], marker='o', linestyle='-', color='green', label='Port 2')
+    plt.plot(df["Number of Cycles"], df["Average 3 Packets Dropped"], marker='o', linestyle='-', color='red', label='Port 3')
+    plt.title("Average Dropped Packets per Port vs Number of Cycles", fontsize=20)
+    plt.xlabel("Number of Cycles", fontsize=16)
+    plt.ylabel("Average Dropped Packets per Port", fontsize=16)
+    plt.grid()
+    plt.legend()
 
 # plot standard deviation of all port dropped packets against number of cycles
-plt.figure(figsize=(10, 6))
-plt.plot(df["Number of Cycles"], df["Standard Deviation Dropped Packets"], marker='o', linestyle='-', color='purple')
-plt.title("Standard Deviation of Dropped Packets vs Number of Cycles", fontsize=20)
-plt.xlabel("Number of Cycles", fontsize=16)
-plt.ylabel("Standard Deviation of Dropped Packets", fontsize=16)
-plt.grid()
-plt.savefig("standard_deviation_dropped_packets_vs_cycles.png")
-plt.show()
+def plot_standard_deviation_dropped_packets_vs_cycles(frames):
+    df = frames[data_file]
+    plt.plot(df["Number of Cycles"], df["Standard Deviation Dropped Packets"], marker='o', linestyle='-', color='purple')
+    plt.title("Standard Deviation of Dropped Packets vs Number of Cycles", fontsize=20)
+    plt.xlabel("Number of Cycles", fontsize=16)
+    plt.ylabel("Standard Deviation of Dropped Packets", fontsize=16)
+    plt.grid()
 
 # plot standard deviation of all port dropped packets vs normalized dropped packets
-plt.figure(figsize=(10, 6))
-standard_deviation_dropped_packets = df["Standard Deviation Dropped Packets"]
-total_packets_generated = df["Total Packets Generated"]
-normalized_standard_deviation = standard_deviation_dropped_packets / total_packets_generated
-plt.plot(df["Number of Cycles"], normalized_standard_deviation, marker='o', linestyle='-', color='purple')
-plt.title("Normalized Standard Deviation of Dropped Packets vs Number of Cycles", fontsize=20)
-plt.xlabel("Number of Cycles", fontsize=16)
-plt.ylabel("Normalized Standard Deviation of Dropped Packets", fontsize=16)
-plt.grid()
-plt.savefig("normalized_standard_deviation_dropped_packets_vs_cycles.png")
-plt.show()
\ No newline at end of file
+def plot_normalized_standard_deviation_dropped_packets_vs_cycles(frames):
+    df = frames[data_file]
+    standard_deviation_dropped_packets = df["Standard Deviation Dropped Packets"]
+    total_packets_generated = df["Total Packets Generated"]
+    normalized_standard_deviation = standard_deviation_dropped_packets / total_packets_generated
+    plt.plot(df["Number of Cycles"], normalized_standard_deviation, marker='o', linestyle='-', color='purple')
+    plt.title("Normalized Standard Deviation of Dropped Packets vs Number of Cycles", fontsize=20)
+    plt.xlabel("Number of Cycles", fontsize=16)
+    plt.ylabel("Normalized Standard Deviation of Dropped Packets", fontsize=16)
+    plt.grid()
+
+TARGETS = [
+    Figure_Target(
+        DATA_DIR / "average_dropped_packets_vs_total_packets_generated.png",
+        {data_file: ["Total Packets Generated", "Average Dropped Packets"]},
+        plot_average_dropped_packets_vs_total_packets_generated,
+    ),
+    Figure_Target(
+        DATA_DIR / "average_dropped_packets_vs_cycles.png",
+        {data_file: ["Number of Cycles", "Average Dropped Packets"]},
+        plot_average_dropped_packets_vs_cycles,
+    ),
+    Figure_Target(
+        DATA_DIR / "ratio_dropped_packets_vs_cycles.png",
+        {data_file: ["Number of Cycles", "Ratio of Dropped Packets to Total Cycles"]},
+        plot_ratio_dropped_packets_vs_cycles,
+    ),
+    Figure_Target(
+        DATA_DIR / "total_packets_generated_vs_cycles.png",
+        {data_file: ["Number of Cycles", "Total Packets Generated"]},
+        plot_total_packets_generated_vs_cycles,
+    ),
+    Figure_Target(
+        DATA_DIR / "average_dropped_packets_per_port_vs_cycles.png",
+        {data_file: ["Number of Cycles", "Average 0 Packets Dropped", "Average 1 Packets Dropped",
+                     "Average 2 Packets Dropped", "Average 3 Packets Dropped"]},
+        plot_average_dropped_packets_per_port_vs_cycles,
+    ),
+    Figure_Target(
+        DATA_DIR / "standard_deviation_dropped_packets_vs_cycles.png",
+        {data_file: ["Number of Cycles", "Standard Deviation Dropped Packets"]},
+        plot_standard_deviation_dropped_packets_vs_cycles,
+    ),
+    Figure_Target(
+        DATA_DIR / "normalized_standard_deviation_dropped_packets_vs_cycles.png",
+        {data_file: ["Number of Cycles", "Standard Deviation Dropped Packets", "Total Packets Generated"]},
+        plot_normalized_standard_deviation_dropped_packets_vs_cycles,
+    ),
+]
+
+if __name__ == "__main__":
+    build(TARGETS)
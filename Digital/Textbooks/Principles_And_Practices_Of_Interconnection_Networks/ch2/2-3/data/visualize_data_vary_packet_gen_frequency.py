@@ -1,70 +1,91 @@
 import matplotlib.pyplot as plt
-import pandas as pd
+
+from figure_pipeline import DATA_DIR, Figure_Target, build
 
 # read in random_traffic_results.csv
-df = pd.read_csv("random_traffic_results_constant_number_of_cycles.csv")
+data_file = DATA_DIR / "random_traffic_results_constant_number_of_cycles.csv"
 
 # plot average dropped packets against total packets generated
-plt.figure(figsize=(10, 6))
-plt.plot(df["Total Packets Generated"], df["Average Dropped Packets"], marker='o', linestyle='-', color='m')
-plt.title("Average Dropped Packets vs Total Packets Generated (Constant Number of Cycles)", fontsize=20)
-plt.xlabel("Total Packets Generated", fontsize=16)
-plt.ylabel("Average Dropped Packets", fontsize=16)
-plt.grid()
-plt.savefig("average_dropped_packets_vs_total_packets_generated.png")
-plt.show()
+def plot_average_dropped_packets_vs_total_packets_generated(frames):
+    df = frames[data_file]
+    plt.plot(df["Total Packets Generated"], df["Average Dropped Packets"], marker='o', linestyle='-', color='m')
+    plt.title("Average Dropped Packets vs Total Packets Generated (Constant Number of Cycles)", fontsize=20)
+    plt.xlabel("Total Packets Generated", fontsize=16)
+    plt.ylabel("Average Dropped Packets", fontsize=16)
+    plt.grid()
 
 # plot the ratio of dropped packets against the generation frequency
-plt.figure(figsize=(10, 6))
-plt.plot(df["Packet Generation Frequency"], df["Ratio of Dropped Packets to Packet Generation Frequency"], marker='o', linestyle='-', color='y')
-plt.title("Ratio of Dropped Packets vs Packet Generation Frequency", fontsize=20)
-plt.xlabel("Packet Generation Frequency", fontsize=16)
-plt.ylabel("Ratio of Dropped Packets", fontsize=16)
-plt.grid()
-plt.savefig("ratio_dropped_packets_vs_packet_generation_frequency.png")
-plt.show()
+def plot_ratio_dropped_packets_vs_packet_generation_frequency(frames):
+    df = frames[data_file]
+    plt.plot(df["Packet Generation Frequency"], df["Ratio of Dropped Packets to Packet Generation Frequency"], marker='o', linestyle='-', color='y')
+    plt.title("Ratio of Dropped Packets vs Packet Generation Frequency", fontsize=20)
+    plt.xlabel("Packet Generation Frequency", fontsize=16)
+    plt.ylabel("Ratio of Dropped Packets", fontsize=16)
+    plt.grid()
 
 # plot total packets generated against the packet generation frequency
-plt.figure(figsize=(10, 6))
-plt.plot(df["Packet Generation Frequency"], df["Total Packets Generated"], marker='o', linestyle='-', color='c')
-plt.title("Total Packets Generated vs Packet Generation Frequency", fontsize=20)
-plt.xlabel("Packet Generation Frequency", fontsize=16)
-plt.ylabel("Total Packets Generated", fontsize=16)
-plt.grid()
-plt.savefig("total_packets_generated_vs_packet_generation_frequency.png")
-plt.show()
+def plot_total_packets_generated_vs_packet_generation_frequency(frames):
+    df = frames[data_file]
+    plt.plot(df["Packet Generation Frequency"], df["Total Packets Generated"], marker='o', linestyle='-', color='c')
+    plt.title("Total Packets Generated vs Packet Generation Frequency", fontsize=20)
+    plt.xlabel("Packet Generation Frequency", fontsize=16)
+    plt.ylabel("Total Packets Generated", fontsize=16)
+    plt.grid()
 
 # plot average dropped packets per port against packet generation frequency
-plt.figure(figsize=(10, 6))
-# Plot all 4 ports
-plt.plot(df["Packet Generation Frequency"], df["Average 0 Packets Dropped"], marker='o', linestyle='-', color='orange', label='Port 0')
-plt.plot(df["Packet Generation Frequency"], df["Average 1 Packets Dropped"], marker='o', linestyle='-', color='blue', label='Port 1')
-plt.plot(df["Packet Generation Frequency"], df["Average 2 Packets Dropped"], marker='o', linestyle='-', color='green', label='Port 2')
-plt.plot(df["Packet Generation Frequency"], df["Average 3 Packets Dropped"], marker='o', linestyle='-', color='red', label='Port 3')
-plt.title("Average Dropped Packets per Port vs Packet Generation Frequency", fontsize=20)
-plt.xlabel("Packet Generation Frequency", fontsize=16)
-plt.ylabel("Average Dropped Packets per Port", fontsize=16)
-plt.grid()
-plt.legend()
-plt.savefig("average_dropped_packets_per_port_vs_packet_generation_frequency.png")
-plt.show()
+def plot_average_dropped_packets_per_port_vs_packet_generation_frequency(frames):
+    df = frames[data_file]
+    # Plot all 4 ports
+    plt.plot(df["Packet Generation Frequency"], df["Average 0 Packets Dropped"], marker='o', linestyle='-', color='orange', label='Port 0')
+    plt.plot(df["Packet Generation Frequency"], df["Average 1 Packets Dropped"], marker='o', linestyle='-', color='blue', label='Port 1')
+    plt.plot(df["Packet Generation Frequency"], df["Average 2 Packets Dropped"], marker='o', linestyle='-', color='green', label='Port 2')
+    plt.plot(df["Packet Generation Frequency"], df["Average 3 Packets Dropped"], marker='o', linestyle='-', color='red', label='Port 3')
+    plt.title("Average Dropped Packets per Port vs Packet Generation Frequency", fontsize=20)
+    plt.xlabel("Packet Generation Frequency", fontsize=16)
+    plt.ylabel("Average Dropped Packets per Port", fontsize=16)
+    plt.grid()
+    plt.legend()
 
 # plot standard deviation of dropped packets against packet generation frequency
-plt.figure(figsize=(10, 6))
-plt.plot(df["Packet Generation Frequency"], df["Standard Deviation Dropped Packets"], marker='o', linestyle='-', color='purple')
-plt.title("Standard Deviation of Dropped Packets vs Packet Generation Frequency", fontsize=20)
-plt.xlabel("Packet Generation Frequency", fontsize=16)
-plt.ylabel("Standard Deviation of Dropped Packets", fontsize=16)
-plt.grid()
-plt.savefig("standard_deviation_dropped_packets_vs_packet_generation_frequency.png")
-plt.show()
+def plot_standard_deviation_dropped_packets_vs_packet_generation_frequency(frames):
+    df = frames[data_file]
+    plt.plot(df["Packet Generation Frequency"], df["Standard Deviation Dropped Packets"], marker='o', linestyle='-', color='purple')
+    plt.title("Standard Deviation of Dropped Packets vs Packet Generation Frequency", fontsize=20)
+    plt.xlabel("Packet Generation Frequency", fontsize=16)
+    plt.ylabel("Standard Deviation of Dropped Packets", fontsize=16)
+    plt.grid()
+
+# the total packets generated vs frequency plot used to be drawn twice, it is now a single target.
+# the average dropped vs total packets output is suffixed so it no longer overwrites
+# the one written by visualize_data_vary_cycles.py
+TARGETS = [
+    Figure_Target(
+        DATA_DIR / "average_dropped_packets_vs_total_packets_generated_constant_number_of_cycles.png",
+        {data_file: ["Total Packets Generated", "Average Dropped Packets"]},
+        plot_average_dropped_packets_vs_total_packets_generated,
+    ),
+    Figure_Target(
+        DATA_DIR / "ratio_dropped_packets_vs_packet_generation_frequency.png",
+        {data_file: ["Packet Generation Frequency", "Ratio of Dropped Packets to Packet Generation Frequency"]},
+        plot_ratio_dropped_packets_vs_packet_generation_frequency,
+    ),
+    Figure_Target(
+        DATA_DIR / "total_packets_generated_vs_packet_generation_frequency.png",
+        {data_file: ["Packet Generation Frequency", "Total Packets Generated"]},
+        plot_total_packets_generated_vs_packet_generation_frequency,
+    ),
+    Figure_Target(
+        DATA_DIR / "average_dropped_packets_per_port_vs_packet_generation_frequency.png",
+        {data_file: ["Packet Generation Frequency", "Average 0 Packets Dropped", "Average 1 Packets Dropped",
+                     "Average 2 Packets Dropped", "Average 3 Packets Dropped"]},
+        plot_average_dropped_packets_per_port_vs_packet_generation_frequency,
+    ),
+    Figure_Target(
+        DATA_DIR / "standard_deviation_dropped_packets_vs_packet_generation_frequency.png",
+        {data_file: ["Packet Generation Frequency", "Standard Deviation Dropped Packets"]},
+        plot_standard_deviation_dropped_packets_vs_packet_generation_frequency,
+    ),
+]
 
-# plot total packets generated against frequency of packet generation
-plt.figure(figsize=(10, 6))
-plt.plot(df["Packet Generation Frequency"], df["Total Packets Generated"], marker='o', linestyle='-', color='c')
-plt.title("Total Packets Generated vs Packet Generation Frequency", fontsize=20)
-plt.xlabel("Packet Generation Frequency", fontsize=16)
-plt.ylabel("Total Packets Generated", fontsize=16)
-plt.grid()
-plt.savefig("total_packets_generated_vs_packet_generation_frequency.png")
-plt.show()
+if __name__ == "__main__":
+    build(TARGETS)
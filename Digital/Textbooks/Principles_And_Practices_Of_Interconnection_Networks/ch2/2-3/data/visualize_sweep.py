@@ -0,0 +1,65 @@
+import matplotlib.pyplot as plt
+
+from figure_pipeline import DATA_DIR, Figure_Target, build
+
+# CSVs written by test_random_traffic (see Sweep_Spec.data_file_name in ../sweep.py)
+sweep_files = {
+    "round_robin": DATA_DIR / "fairness_random_traffic_results_sweep.csv",
+    "fixed_priority": DATA_DIR / "random_traffic_results_sweep.csv",
+}
+variant_colors = {"round_robin": 'b', "fixed_priority": 'r'}
+
+SWEEP_COLUMNS = ["Packet Generation Frequency", "Drop Rate", "Drop Rate Standard Error", "Refinement Level", "Allocator Variant"]
+
+# plot drop rate against packet generation frequency, coloured by refinement level
+def _plot_drop_rate_by_refinement_level(df):
+    df = df.sort_values("Packet Generation Frequency")
+    plt.plot(df["Packet Generation Frequency"], df["Drop Rate"], linestyle='-', color='gray')
+    for level, level_df in df.groupby("Refinement Level"):
+        label = "Coarse grid" if level == 0 else f"Refinement {level}"
+        plt.errorbar(level_df["Packet Generation Frequency"], level_df["Drop Rate"], yerr=level_df["Drop Rate Standard Error"],
+                     marker='o', linestyle='none', capsize=3, label=label)
+    plt.title(f"Drop Rate vs Packet Generation Frequency ({df['Allocator Variant'].iloc[0]})", fontsize=20)
+    plt.xlabel("Packet Generation Frequency", fontsize=16)
+    plt.ylabel("Drop Rate (Dropped / Generated)", fontsize=16)
+    plt.grid()
+    plt.legend()
+
+def plot_round_robin_drop_rate_vs_packet_generation_frequency(frames):
+    _plot_drop_rate_by_refinement_level(frames[sweep_files["round_robin"]])
+
+def plot_fixed_priority_drop_rate_vs_packet_generation_frequency(frames):
+    _plot_drop_rate_by_refinement_level(frames[sweep_files["fixed_priority"]])
+
+# plot the drop rate of both allocator variants against packet generation frequency
+def plot_drop_rate_vs_packet_generation_frequency_comparison(frames):
+    for variant, data_file in sweep_files.items():
+        df = frames[data_file].sort_values("Packet Generation Frequency")
+        plt.errorbar(df["Packet Generation Frequency"], df["Drop Rate"], yerr=df["Drop Rate Standard Error"],
+                     marker='o', linestyle='-', capsize=3, color=variant_colors[variant], label=df["Allocator Variant"].iloc[0])
+    plt.title("Drop Rate vs Packet Generation Frequency", fontsize=20)
+    plt.xlabel("Packet Generation Frequency", fontsize=16)
+    plt.ylabel("Drop Rate (Dropped / Generated)", fontsize=16)
+    plt.grid()
+    plt.legend()
+
+TARGETS = [
+    Figure_Target(
+        DATA_DIR / "drop_rate_vs_packet_generation_frequency_sweep_round_robin.png",
+        {sweep_files["round_robin"]: SWEEP_COLUMNS},
+        plot_round_robin_drop_rate_vs_packet_generation_frequency,
+    ),
+    Figure_Target(
+        DATA_DIR / "drop_rate_vs_packet_generation_frequency_sweep_fixed_priority.png",
+        {sweep_files["fixed_priority"]: SWEEP_COLUMNS},
+        plot_fixed_priority_drop_rate_vs_packet_generation_frequency,
+    ),
+    Figure_Target(
+        DATA_DIR / "drop_rate_vs_packet_generation_frequency_sweep_comparison.png",
+        {data_file: SWEEP_COLUMNS for data_file in sweep_files.values()},
+        plot_drop_rate_vs_packet_generation_frequency_comparison,
+    ),
+]
+
+if __name__ == "__main__":
+    build(TARGETS)
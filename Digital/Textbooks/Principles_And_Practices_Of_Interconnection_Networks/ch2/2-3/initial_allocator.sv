@@ -38,8 +38,10 @@ module allocator(input logic clk,
     end
 
     initial begin
+`ifndef ALLOCATOR_NO_DUMP
         $dumpfile("allocator.vcd"); // Specify filename
         $dumpvars(0, allocator); // Dump all signals within the scope of my_design
+`endif
         #1; // Wait a small amount of time to ensure dump starts
     end
 endmodule
@@ -0,0 +1,175 @@
+# steady_state.py
+#
+# Steady state detection for a single random traffic trial.
+# Every trial starts from the reset state of the allocator, so the first cycles
+# are a start-up transient. The trial is cut into windows of window_cycles cycles
+# and the dropped packets, generated packets and per port drops of every window are recorded.
+#
+# The warm-up is found separately from the stopping rule, by MSER truncation: the
+# number of leading windows d (at most half of them) that minimises the variance of
+# the remaining window drop counts divided by their number, var(x[d:]) / (n - d).
+# A transient at the start inflates that variance, so it gets cut off.
+#
+# After the warm-up, the remaining windows are split into number_of_batches batches of
+# (nearly) equal size, so the batch size grows as the trial runs. The drop rate is the ratio
+# estimator (sum of dropped / sum of generated) and its batch means confidence half
+# width is
+#     t * sqrt(sum((dropped_j - rate * generated_j) ** 2) / (k - 1) / k) / mean(generated_j)
+# The trial is in steady state once that half width is within relative_tolerance of
+# the drop rate, or within absolute_tolerance for drop rates close to 0.
+
+import math
+
+# two sided 95% Student t quantiles by degrees of freedom
+T_QUANTILES_95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306,
+                  9: 2.262, 10: 2.228, 11: 2.201, 12: 2.179, 13: 2.160, 14: 2.145, 15: 2.131,
+                  16: 2.120, 17: 2.110, 18: 2.101, 19: 2.093, 20: 2.086, 25: 2.060, 30: 2.042}
+
+MSER_GROUP_WINDOWS = 5
+MSER_GROUP_DROPS = 10
+
+
+def t_quantile_95(degrees_of_freedom):
+    # nearest tabulated value at or below degrees_of_freedom, 1.96 past the table
+    if degrees_of_freedom > max(T_QUANTILES_95):
+        return 1.96
+    return T_QUANTILES_95[max(d for d in T_QUANTILES_95 if d <= degrees_of_freedom)]
+
+
+def mser_truncation(values):
+    # MSER: number of leading values to drop, at most half of them,
+    # minimising var(values[d:]) / (len(values) - d)
+    n = len(values)
+    best_d = 0
+    best_statistic = math.inf
+    tail_sum = 0.0
+    tail_square_sum = 0.0
+    statistics = [0.0] * (n // 2 + 1)
+    # walk from the end so every tail sum is built in one pass
+    for d in range(n - 1, -1, -1):
+        tail_sum += values[d]
+        tail_square_sum += values[d] ** 2
+        if d <= n // 2:
+            m = n - d
+            statistics[d] = (tail_square_sum - tail_sum ** 2 / m) / m ** 2
+    for d, statistic in enumerate(statistics):
+        if statistic < best_statistic:
+            best_d, best_statistic = d, statistic
+    return best_d
+
+
+class Steady_State_Detector:
+    def __init__(self, window_cycles=100, number_of_batches=10, relative_tolerance=0.25,
+                 absolute_tolerance=0.01, min_windows=20):
+        if number_of_batches < 2:
+            raise ValueError("Batch means needs at least 2 batches")
+        if min_windows < 2 * number_of_batches:
+            raise ValueError("min_windows must leave at least one window per batch after the warm-up")
+        self.window_cycles = window_cycles
+        self.number_of_batches = number_of_batches
+        self.relative_tolerance = relative_tolerance
+        self.absolute_tolerance = absolute_tolerance
+        self.min_windows = min_windows
+
+        # cumulative (dropped, generated, port 0..3 dropped) at the last window boundary
+        self.last_snapshot = (0, 0, 0, 0, 0, 0)
+        # per window (dropped, generated, port 0..3 dropped)
+        self.windows = []
+
+        self.steady_state_reached = False
+        self.warmup_cycles = None
+        self.steady_state_cycles = 0
+        self.steady_state_dropped_packets = 0
+        self.steady_state_packets_generated = 0
+        self.steady_state_port_dropped_packets = [0, 0, 0, 0]
+        self.steady_state_half_width = None
+
+    @property
+    def steady_state_drop_rate(self):
+        if not self.steady_state_packets_generated:
+            return 0.0
+        return self.steady_state_dropped_packets / self.steady_state_packets_generated
+
+    def update(self, traffic_generator):
+        # Call after every simulated cycle of traffic_generator.
+        # Returns True once steady state is reached and the trial can stop.
+        if self.steady_state_reached:
+            return True
+        if traffic_generator.debug_cycle_counter % self.window_cycles:
+            return False
+
+        self._record_window(traffic_generator)
+        if len(self.windows) < self.min_windows:
+            return False
+        first_window, half_width = self._batch_means()
+        self._measure(first_window, half_width)
+        self.steady_state_reached = half_width <= self._tolerance()
+        return self.steady_state_reached
+
+    def finish(self):
+        # Call once a trial ends without reaching steady state.
+        # The metrics still exclude the MSER warm-up, steady_state_reached stays False.
+        # Returns False when the trial had too few windows to measure anything.
+        if self.steady_state_reached:
+            return True
+        if len(self.windows) < 2 * self.number_of_batches:
+            return False
+        self._measure(*self._batch_means())
+        return True
+
+    def _record_window(self, traffic_generator):
+        snapshot = (
+            traffic_generator.allocator_handler.number_of_dropped_packets,
+            traffic_generator.total_packets_generated,
+            traffic_generator.number_of_0_packets_dropped,
+            traffic_generator.number_of_1_packets_dropped,
+            traffic_generator.number_of_2_packets_dropped,
+            traffic_generator.number_of_3_packets_dropped,
+        )
+        self.windows.append(tuple(now - last for now, last in zip(snapshot, self.last_snapshot)))
+        self.last_snapshot = snapshot
+
+    def _batch_means(self):
+        # Returns (first measured window, confidence half width of the drop rate)
+        n = len(self.windows)
+        # MSER on sums of group_windows windows (MSER-5 at least). At low load single windows
+        # hold too few drops and MSER would cut off the ones that happen to contain a drop,
+        # so groups grow until they hold about MSER_GROUP_DROPS drops on average.
+        total_drops = sum(window[0] for window in self.windows)
+        group_windows = max(MSER_GROUP_WINDOWS, math.ceil(MSER_GROUP_DROPS * n / total_drops) if total_drops else n)
+        grouped_drops = [sum(window[0] for window in self.windows[i:i + group_windows])
+                         for i in range(0, n - group_windows + 1, group_windows)]
+        first_window = mser_truncation(grouped_drops) * group_windows
+
+        # k batches of as equal a size as possible over every window after the warm-up
+        k = self.number_of_batches
+        measured_windows = n - first_window
+        batches = []
+        for j in range(k):
+            batch = self.windows[first_window + j * measured_windows // k:first_window + (j + 1) * measured_windows // k]
+            batches.append((sum(window[0] for window in batch), sum(window[1] for window in batch)))
+        total_dropped = sum(dropped for dropped, _ in batches)
+        total_generated = sum(generated for _, generated in batches)
+        if not total_generated:
+            return first_window, math.inf
+        rate = total_dropped / total_generated
+        residual_variance = sum((dropped - rate * generated) ** 2 for dropped, generated in batches) / (k - 1)
+        half_width = t_quantile_95(k - 1) * math.sqrt(residual_variance / k) / (total_generated / k)
+        # the batches can look calmer than the packets they count (all zero drops at low load),
+        # so the half width is never below the binomial one, with (dropped + 1) / (generated + 2)
+        # keeping it above zero before the first drop
+        binomial_rate = (total_dropped + 1) / (total_generated + 2)
+        binomial_half_width = 1.96 * math.sqrt(binomial_rate * (1 - binomial_rate) / total_generated)
+        return first_window, max(half_width, binomial_half_width)
+
+    def _measure(self, first_window, half_width):
+        measured = self.windows[first_window:]
+        self.warmup_cycles = first_window * self.window_cycles
+        self.steady_state_cycles = len(measured) * self.window_cycles
+        self.steady_state_dropped_packets = sum(window[0] for window in measured)
+        self.steady_state_packets_generated = sum(window[1] for window in measured)
+        self.steady_state_port_dropped_packets = [sum(window[2 + port] for window in measured) for port in range(4)]
+        self.steady_state_half_width = half_width
+
+    def _tolerance(self):
+        return max(self.relative_tolerance * self.steady_state_drop_rate, self.absolute_tolerance)
@@ -0,0 +1,138 @@
+# sweep.py
+#
+# Declarative sweep specification for the allocator random traffic test.
+# A Sweep_Spec describes a grid of number of cycles x packet generation frequency,
+# the allocator variants it applies to and the seeds run at every point.
+# The grid is first run coarsely, then refined only where the drop rate curve
+# bends sharply (the saturation knee), instead of running a dense uniform grid.
+# Optionally every trial stops as soon as it reaches steady state (see steady_state.py).
+
+import math
+
+from steady_state import Steady_State_Detector
+
+# allocator variant -> (RTL source, prefix of the CSV written by the sweep)
+ALLOCATOR_VARIANTS = {
+    "round_robin": ("allocator.sv", "fairness_"),
+    "fixed_priority": ("initial_allocator.sv", ""),
+}
+
+
+def frange(start, stop, step):
+    # inclusive float range, rounded so values compare and print cleanly
+    values = []
+    i = 0
+    while start + i * step <= stop + step / 2:
+        values.append(round(start + i * step, 6))
+        i += 1
+    return values
+
+
+def find_knee_midpoints(xs, ys, stderrs, noise_factor=4.0, bend_fraction=0.5, min_step=0.0):
+    # Returns the new x values to simulate around the sharpest bends of y(x).
+    # The bend at an interior point is the change in slope between its two
+    # neighbouring intervals. Each slope is divided by its interval, so the noise of
+    # the bend grows as the grid gets finer; stderrs (the standard error of every y,
+    # from the spread over seeds) gives that noise level. Only bends larger than
+    # noise_factor times their own noise are kept, and of those only the ones of at
+    # least bend_fraction of the largest. Both intervals around such a point are
+    # halved, unless the halves would be narrower than min_step.
+    significant_bends = []
+    for i in range(1, len(xs) - 1):
+        left_width = xs[i] - xs[i - 1]
+        right_width = xs[i + 1] - xs[i]
+        left_slope = (ys[i] - ys[i - 1]) / left_width
+        right_slope = (ys[i + 1] - ys[i]) / right_width
+        bend = abs(right_slope - left_slope)
+        # bend = y[i+1] / right_width - y[i] * (1 / right_width + 1 / left_width) + y[i-1] / left_width
+        noise = math.sqrt((stderrs[i + 1] / right_width) ** 2
+                          + (stderrs[i] * (1 / right_width + 1 / left_width)) ** 2
+                          + (stderrs[i - 1] / left_width) ** 2)
+        if bend > noise_factor * noise:
+            significant_bends.append((bend, i))
+
+    if not significant_bends:
+        return []
+    max_bend = max(bend for bend, _ in significant_bends)
+
+    midpoints = set()
+    for bend, i in significant_bends:
+        if bend < bend_fraction * max_bend:
+            continue
+        for a, b in ((xs[i - 1], xs[i]), (xs[i], xs[i + 1])):
+            if (b - a) / 2 >= min_step:
+                midpoints.add(round((a + b) / 2, 6))
+    return sorted(midpoints - set(xs))
+
+
+class Sweep_Spec:
+    # cycles and packet_generation_frequencies define the coarse grid.
+    # Refinement happens along the frequency axis, separately for each number of
+    # cycles, for at most max_refinements rounds. It needs at least two seeds,
+    # the spread over seeds is what tells a real bend from noise.
+    # With steady_state_window_cycles set, cycles is the maximum length of a trial and
+    # every trial stops once the batch means half width of its drop rate after the warm-up
+    # is within steady_state_relative_tolerance (or steady_state_absolute_tolerance).
+
+    def __init__(self, name, cycles, packet_generation_frequencies, variants, seeds,
+                 max_refinements=3, noise_factor=4.0, bend_fraction=0.5, min_frequency_step=0.01,
+                 steady_state_window_cycles=None, steady_state_batches=10, steady_state_relative_tolerance=0.25,
+                 steady_state_absolute_tolerance=0.01, steady_state_min_windows=20):
+        for variant in variants:
+            if variant not in ALLOCATOR_VARIANTS:
+                raise ValueError(f"Unknown allocator variant: {variant}")
+        if steady_state_window_cycles is not None and min(cycles) < steady_state_window_cycles * steady_state_min_windows:
+            raise ValueError(f"Trials of {min(cycles)} cycles are too short for {steady_state_min_windows} "
+                             f"steady state windows of {steady_state_window_cycles} cycles")
+        # the same constraints as Steady_State_Detector, checked here so a bad spec fails before any trial runs
+        if steady_state_window_cycles is not None and steady_state_batches < 2:
+            raise ValueError("Batch means needs at least 2 steady state batches")
+        if steady_state_window_cycles is not None and steady_state_min_windows < 2 * steady_state_batches:
+            raise ValueError(f"{steady_state_min_windows} steady state windows leave less than one window per batch "
+                             f"for {steady_state_batches} batches after the warm-up")
+        self.name = name
+        self.cycles = sorted(cycles)
+        self.packet_generation_frequencies = sorted(round(f, 6) for f in packet_generation_frequencies)
+        self.variants = list(variants)
+        self.seeds = list(seeds)
+        self.max_refinements = max_refinements
+        self.bend_fraction = bend_fraction
+        self.noise_factor = noise_factor
+        self.min_frequency_step = min_frequency_step
+        self.steady_state_window_cycles = steady_state_window_cycles
+        self.steady_state_batches = steady_state_batches
+        self.steady_state_relative_tolerance = steady_state_relative_tolerance
+        self.steady_state_absolute_tolerance = steady_state_absolute_tolerance
+        self.steady_state_min_windows = steady_state_min_windows
+
+    def data_file_name(self, variant, number_of_lanes=0):
+        # lane runs (allocator_lanes.sv) get their own file so they never overwrite the sequential results
+        _, prefix = ALLOCATOR_VARIANTS[variant]
+        lanes_suffix = f"_{number_of_lanes}_lanes" if number_of_lanes else ""
+        return f"data/{prefix}{self.name}{lanes_suffix}.csv"
+
+    def new_steady_state_detector(self):
+        # a fresh detector for one trial, None when trials always run to the end
+        if self.steady_state_window_cycles is None:
+            return None
+        return Steady_State_Detector(self.steady_state_window_cycles, self.steady_state_batches,
+                                     self.steady_state_relative_tolerance, self.steady_state_absolute_tolerance,
+                                     self.steady_state_min_windows)
+
+    def coarse_points(self):
+        return [(cycles, frequency) for cycles in self.cycles for frequency in self.packet_generation_frequencies]
+
+    def refine_points(self, drop_rates):
+        # drop_rates maps (cycles, frequency) -> (measured drop rate, its standard error)
+        # for every point run so far.
+        # Returns the (cycles, frequency) points to run in the next round.
+        new_points = []
+        for cycles in self.cycles:
+            row = sorted((frequency, rate, stderr) for (c, frequency), (rate, stderr) in drop_rates.items() if c == cycles)
+            frequencies = [frequency for frequency, _, _ in row]
+            rates = [rate for _, rate, _ in row]
+            stderrs = [stderr for _, _, stderr in row]
+            for frequency in find_knee_midpoints(frequencies, rates, stderrs, self.noise_factor,
+                                                 self.bend_fraction, self.min_frequency_step):
+                new_points.append((cycles, frequency))
+        return new_points
@@ -7,9 +7,13 @@ import cocotb
 from cocotb.triggers import Timer, FallingEdge, RisingEdge
 from cocotb.clock import Clock
 import random
+import os
+import json
 import pandas as pd
 import math
 
+from sweep import Sweep_Spec, frange
+
 random.seed(0)  # Forreproducibility in tests
 
 HEADER_PHIT_TYPE = 0b11
@@ -74,12 +78,13 @@ class Packet:
     
     # This class creates a packet with a random total size from 32 to 512 bits of data.
     # it will include a header phit with a random destination address, and then 0 or more payload phits.
-    def __init__(self, log=False):
+    # rng is the random number source, either the random module or a random.Random instance.
+    def __init__(self, log=False, rng=random):
         self.phits = []
-        self.total_data_size = random.randint(32, 512) // 16 * 16  # Total data size must be a multiple of 16 bits
+        self.total_data_size = rng.randint(32, 512) // 16 * 16  # Total data size must be a multiple of 16 bits
         self.number_of_data_phits = self.total_data_size // 16
         self.total_size_bits = self.total_data_size + (self.total_data_size / 16)*2 + 18  # Total size includes header and payload phits
-        self.destination = random.randint(0, 63)  # Destination address is 6 bits
+        self.destination = rng.randint(0, 63)  # Destination address is 6 bits
         self.create_phits()
 
         if log:
@@ -139,9 +144,8 @@ class Allocator_Handler:
         dut.r2.value = phit2.allocator_input()
         dut.r3.value = phit3.allocator_input()
 
-    def _packet_was_dropped(self, dut,port_number):
+    def _packet_was_dropped(self, hold, port_number):
         # Assumed always working with header phits
-        hold = dut.hold.value
         if port_number == 0 and hold != 0b0001 and hold != 0b0000:
             return True
         elif port_number == 1 and hold != 0b0010 and hold != 0b0000:
@@ -152,28 +156,37 @@ class Allocator_Handler:
             return True
         return False
 
+    def _is_request(self, this_port, phit: Phit):
+        # header phits for this port are the only ones the allocator arbitrates
+        return phit.type == HEADER_PHIT_TYPE and (phit.get_address() >> 4) == this_port
+
     def process_interaction(self, dut, phit: Phit, port_number, callback):
-        if phit.type != HEADER_PHIT_TYPE or (phit.get_address() >> 4) != dut.thisPort.value:
-            return
-        
-        if self.log:
+        this_port = dut.thisPort.value
+        hold = dut.hold.value
+
+        if self.log and self._is_request(this_port, phit):
             dut._log.info("Allocator interaction with phit: %s", phit)
             dut._log.info("Allocator input value: %s", bin(phit.allocator_input()))
 
-        # log output
-        if self.log:
+            # log output
             dut._log.info("select: %s", bin(dut.select.value)[2:].zfill(4))
             dut._log.info("shift: %s", bin(dut.shift.value)[2:].zfill(4))
-            dut._log.info("hold: %s", bin(dut.hold.value)[2:].zfill(4))
+            dut._log.info("hold: %s", bin(hold)[2:].zfill(4))
 
-        if self._packet_was_dropped(dut, port_number):
-            # Header packet showed up and hold is set, so packet is dropped
-            self.number_of_dropped_packets += 1
-            callback(port_number)
+        if self.process_lane_interaction(this_port, hold, phit, port_number, callback) and self.log:
+            self.packet_dropped_log(dut)
 
-            if self.log:
-                self.packet_dropped_log(dut)
+    def process_lane_interaction(self, this_port, hold, phit: Phit, port_number, callback):
+        # Counts a dropped packet when phit is a header for this_port and hold is taken by another port.
+        # this_port and hold are the values already read from the bus, one lane of allocator_lanes
+        # or the single allocator through process_interaction. Returns True when the packet was dropped.
+        if not self._is_request(this_port, phit) or not self._packet_was_dropped(hold, port_number):
+            return False
 
+        # Header packet showed up and hold is set, so packet is dropped
+        self.number_of_dropped_packets += 1
+        callback(port_number)
+        return True
 
     def packet_dropped_log(self, dut):
         dut._log.info("\n############################\n")
@@ -185,10 +198,17 @@ class Traffic_Generator:
     # at random time intervals, a packet will be created and
     # the phits will be popped and sent to the allocator input.
 
-    def __init__(self, dut, number_of_cycles=100, packet_generation_frequency=0.1, log=True):
+    # dut is None when the generator only produces phits for one lane of allocator_lanes,
+    # the lane driver then owns the bus (see test_allocator_lanes.py).
+    # steady_state_detector, if given, ends process_traffic early once the trial reaches steady state.
+    def __init__(self, dut, number_of_cycles=100, packet_generation_frequency=0.1, log=True, rng=random,
+                 steady_state_detector=None):
         self.dut = dut
+        self.steady_state_detector = steady_state_detector
+        self.rng = rng
         self.allocator_handler = Allocator_Handler(log=log)
-        self.allocator_handler.initialize_allocator(dut)
+        if dut is not None:
+            self.allocator_handler.initialize_allocator(dut)
         self.packet_generation_frequency = packet_generation_frequency
         self.number_of_cycles = number_of_cycles
         self.debug_cycle_counter = 0
@@ -223,51 +243,56 @@ class Traffic_Generator:
     def generate_traffic(self):
         # Randomly decide if a packet should be created or not.
         # If a packet is already being processed, do not create a new one.
-        if not self.packet0 and random.random() < self.packet_generation_frequency:
-            self.packet0 = Packet(self.log)
+        if not self.packet0 and self.rng.random() < self.packet_generation_frequency:
+            self.packet0 = Packet(self.log, self.rng)
             self.total_packets_generated += 1
             if self.log:
                 self._packet_generated_log(0)
-        if not self.packet1 and random.random() < self.packet_generation_frequency:
-            self.packet1 = Packet(self.log)
+        if not self.packet1 and self.rng.random() < self.packet_generation_frequency:
+            self.packet1 = Packet(self.log, self.rng)
             self.total_packets_generated += 1
             if self.log:
                 self._packet_generated_log(1)
-        if not self.packet2 and random.random() < self.packet_generation_frequency:
-            self.packet2 = Packet(self.log)
+        if not self.packet2 and self.rng.random() < self.packet_generation_frequency:
+            self.packet2 = Packet(self.log, self.rng)
             self.total_packets_generated += 1
             if self.log:
                 self._packet_generated_log(2)
-        if not self.packet3 and random.random() < self.packet_generation_frequency:
-            self.packet3 = Packet(self.log)
+        if not self.packet3 and self.rng.random() < self.packet_generation_frequency:
+            self.packet3 = Packet(self.log, self.rng)
             self.total_packets_generated += 1
             if self.log:
                 self._packet_generated_log(3)
 
+    def next_phits(self):
+        # Generates traffic and pops the phits presented to the allocator this cycle
+        self.generate_traffic()
+        # initialize phits to null
+        phit0 = Phit(NULL_PHIT_TYPE)
+        phit1 = Phit(NULL_PHIT_TYPE)
+        phit2 = Phit(NULL_PHIT_TYPE)
+        phit3 = Phit(NULL_PHIT_TYPE)
+        if self.packet0:
+            phit0 = self.packet0.pop_phit()
+            if not self.packet0.phits:
+                self.packet0 = None
+        if self.packet1:
+            phit1 = self.packet1.pop_phit()
+            if not self.packet1.phits:
+                self.packet1 = None
+        if self.packet2:
+            phit2 = self.packet2.pop_phit()
+            if not self.packet2.phits:
+                self.packet2 = None
+        if self.packet3:
+            phit3 = self.packet3.pop_phit()
+            if not self.packet3.phits:
+                self.packet3 = None
+        return phit0, phit1, phit2, phit3
+
     async def process_traffic(self):
         for _ in range(self.number_of_cycles):
-            self.generate_traffic()
-            # initialize phits to null
-            phit0 = Phit(NULL_PHIT_TYPE)
-            phit1 = Phit(NULL_PHIT_TYPE)
-            phit2 = Phit(NULL_PHIT_TYPE)
-            phit3 = Phit(NULL_PHIT_TYPE)
-            if self.packet0:
-                phit0 = self.packet0.pop_phit()
-                if not self.packet0.phits:
-                    self.packet0 = None
-            if self.packet1:
-                phit1 = self.packet1.pop_phit()
-                if not self.packet1.phits:
-                    self.packet1 = None
-            if self.packet2:
-                phit2 = self.packet2.pop_phit()
-                if not self.packet2.phits:
-                    self.packet2 = None
-            if self.packet3:
-                phit3 = self.packet3.pop_phit()
-                if not self.packet3.phits:
-                    self.packet3 = None
+            phit0, phit1, phit2, phit3 = self.next_phits()
             self.allocator_handler.handle_inputs(
                 self.dut,
                 phit0,
@@ -286,11 +311,206 @@ class Traffic_Generator:
 
             self.debug_cycle_counter += 1
 
+            if self.steady_state_detector and self.steady_state_detector.update(self):
+                break
+
+# Sweep run by test_random_traffic.
+# The allocator variant is picked at build time (see ALLOCATOR_VARIANT in the Makefile),
+# only the variants listed here are swept.
+RANDOM_TRAFFIC_SWEEP = Sweep_Spec(
+    name="random_traffic_results_sweep",
+    # upper bound, trials stop at steady state. Past f = 0.3 most trials converge well before it,
+    # below f = 0.1 too few packets are generated and trials run to the bound
+    cycles=[5000],
+    # the saturation knee sits below 0.1, 0.01 anchors the low end of the curve
+    packet_generation_frequencies=[0.01] + frange(0.1, 1.0, 0.1),
+    variants=["round_robin", "fixed_priority"],
+    seeds=range(10),
+    steady_state_window_cycles=100,
+)
+
+def measure_trial(traffic_generator):
+    # Returns (cycles, dropped, generated, per port dropped) of the measured part of a trial:
+    # the steady state windows with steady state detection, the whole trial without it.
+    detector = traffic_generator.steady_state_detector
+    if detector is None:
+        return (
+            traffic_generator.debug_cycle_counter,
+            traffic_generator.allocator_handler.number_of_dropped_packets,
+            traffic_generator.total_packets_generated,
+            [
+                traffic_generator.number_of_0_packets_dropped,
+                traffic_generator.number_of_1_packets_dropped,
+                traffic_generator.number_of_2_packets_dropped,
+                traffic_generator.number_of_3_packets_dropped,
+            ],
+        )
+    if not detector.finish():
+        raise ValueError(f"Trial of {traffic_generator.debug_cycle_counter} cycles is too short to measure after its warm-up")
+    return (
+        detector.steady_state_cycles,
+        detector.steady_state_dropped_packets,
+        detector.steady_state_packets_generated,
+        detector.steady_state_port_dropped_packets,
+    )
+
+def summarize_trials(dut, number_of_cycles, packet_generation_frequency, traffic_generators):
+    # Averages the finished trials of a single sweep point into one CSV row.
+    # Without steady state detection every column covers the whole trial of number_of_cycles cycles.
+    # With it, every column is measured over the steady state windows of each trial (after
+    # its warm-up) and normalised per measured cycle, since trials stop at different cycles.
+    # number_of_cycles is then only the upper bound, reported as Maximum Number of Cycles.
+    # Trials that hit the bound without reaching steady state are still measured after
+    # their MSER warm-up, counted in Unconverged Trials and logged as a warning.
+    steady_state_mode = traffic_generators[0].steady_state_detector is not None
+    total_iterations = len(traffic_generators)
+    total_simulated_cycles = 0
+    total_measured_cycles = 0
+    total_warmup_cycles = 0
+    measured_packets_dropped = 0
+    measured_packets_generated = 0
+    measured_drop_rates = []
+    steady_state_trials = 0
+    # per trial dropped, per port dropped and generated packets, per cycle in steady state mode
+    trial_dropped_packets = []
+    trial_port_dropped_packets = []
+    trial_packets_generated = []
+    for traffic_generator in traffic_generators:
+        detector = traffic_generator.steady_state_detector
+        total_simulated_cycles += traffic_generator.debug_cycle_counter
+        trial_cycles, trial_dropped, trial_generated, trial_port_dropped = measure_trial(traffic_generator)
+        if detector:
+            steady_state_trials += detector.steady_state_reached
+            total_warmup_cycles += detector.warmup_cycles
+        total_measured_cycles += trial_cycles
+        measured_packets_dropped += trial_dropped
+        measured_packets_generated += trial_generated
+        measured_drop_rates.append(trial_dropped / trial_generated if trial_generated else 0.0)
+
+        scale = 1 / trial_cycles if steady_state_mode else 1
+        trial_dropped_packets.append(trial_dropped * scale)
+        trial_port_dropped_packets.append([port_dropped * scale for port_dropped in trial_port_dropped])
+        trial_packets_generated.append(trial_generated * scale)
+
+    unconverged_trials = total_iterations - steady_state_trials
+    if steady_state_mode and unconverged_trials:
+        dut._log.warning(f"{unconverged_trials} of {total_iterations} trials at frequency {packet_generation_frequency} "
+                         f"did not reach steady state within {number_of_cycles} cycles, measured after their warm-up")
+
+    average_dropped_packets = sum(trial_dropped_packets) / total_iterations
+    average_0_packets_dropped = sum(port_dropped[0] for port_dropped in trial_port_dropped_packets) / total_iterations
+    average_1_packets_dropped = sum(port_dropped[1] for port_dropped in trial_port_dropped_packets) / total_iterations
+    average_2_packets_dropped = sum(port_dropped[2] for port_dropped in trial_port_dropped_packets) / total_iterations
+    average_3_packets_dropped = sum(port_dropped[3] for port_dropped in trial_port_dropped_packets) / total_iterations
+    average_packets_generated = sum(trial_packets_generated) / total_iterations
+    # standard error of the drop rate from the spread over seeds, used to refine the sweep
+    drop_rate_standard_error = 0.0
+    if total_iterations > 1:
+        mean_drop_rate = sum(measured_drop_rates) / total_iterations
+        drop_rate_variance = sum((rate - mean_drop_rate) ** 2 for rate in measured_drop_rates) / (total_iterations - 1)
+        drop_rate_standard_error = math.sqrt(drop_rate_variance / total_iterations)
+
+    average_simulated_cycles = total_simulated_cycles / total_iterations
+    standard_deviation_dropped_packets = math.sqrt(
+        (average_0_packets_dropped ** 2 + average_1_packets_dropped ** 2 + average_2_packets_dropped ** 2 + average_3_packets_dropped ** 2) / 4
+    )
+    drop_rate = measured_packets_dropped / measured_packets_generated if measured_packets_generated else 0.0
+
+    dut._log.info(f"\n\nCompleted {total_iterations} iterations of up to {number_of_cycles} cycles at frequency {packet_generation_frequency}.\n")
+    dut._log.info(f"\n\nDrop rate: {drop_rate}\n")
+
+    if not steady_state_mode:
+        return {
+            "Number of Cycles": number_of_cycles,
+            "Packet Generation Frequency": packet_generation_frequency,
+            "Average Dropped Packets": average_dropped_packets,
+            "Ratio of Dropped Packets to Total Cycles": average_dropped_packets / number_of_cycles,
+            "Ratio of Dropped Packets to Packet Generation Frequency": average_dropped_packets / packet_generation_frequency,
+            "Total Packets Generated": traffic_generators[-1].total_packets_generated,
+            "Average 0 Packets Dropped": average_0_packets_dropped,
+            "Average 1 Packets Dropped": average_1_packets_dropped,
+            "Average 2 Packets Dropped": average_2_packets_dropped,
+            "Average 3 Packets Dropped": average_3_packets_dropped,
+            "Standard Deviation Dropped Packets": standard_deviation_dropped_packets,
+            "Average Packets Generated": average_packets_generated,
+            "Drop Rate": drop_rate,
+            "Drop Rate Standard Error": drop_rate_standard_error,
+            "Average Simulated Cycles": average_simulated_cycles,
+        }
+
+    return {
+        "Maximum Number of Cycles": number_of_cycles,
+        "Packet Generation Frequency": packet_generation_frequency,
+        "Average Dropped Packets per Cycle": average_dropped_packets,
+        "Ratio of Dropped Packets per Cycle to Packet Generation Frequency": average_dropped_packets / packet_generation_frequency,
+        "Average 0 Packets Dropped per Cycle": average_0_packets_dropped,
+        "Average 1 Packets Dropped per Cycle": average_1_packets_dropped,
+        "Average 2 Packets Dropped per Cycle": average_2_packets_dropped,
+        "Average 3 Packets Dropped per Cycle": average_3_packets_dropped,
+        "Standard Deviation Dropped Packets per Cycle": standard_deviation_dropped_packets,
+        "Average Packets Generated per Cycle": average_packets_generated,
+        "Drop Rate": drop_rate,
+        "Drop Rate Standard Error": drop_rate_standard_error,
+        "Average Simulated Cycles": average_simulated_cycles,
+        "Average Measured Cycles": total_measured_cycles / total_iterations,
+        "Average Warm-up Cycles": total_warmup_cycles / total_iterations,
+        "Steady State Trials": steady_state_trials,
+        "Unconverged Trials": unconverged_trials,
+    }
+
+async def run_sweep_point(dut, number_of_cycles, packet_generation_frequency, sweep):
+    # Runs one trial per seed at a single sweep point and returns the averaged CSV row
+    traffic_generators = []
+    for seed in sweep.seeds:
+        traffic_generator = Traffic_Generator(
+            dut,
+            number_of_cycles=number_of_cycles,
+            packet_generation_frequency=packet_generation_frequency,
+            log=False,
+            rng=random.Random(seed),
+            steady_state_detector=sweep.new_steady_state_detector(),
+        )
+        await traffic_generator.process_traffic()
+        traffic_generators.append(traffic_generator)
+
+        dut._log.info(f"\n\nRandom traffic test completed for seed {seed}\n")
+        dut._log.info("Number of dropped packets: %d", traffic_generator.allocator_handler.number_of_dropped_packets)
+
+    return summarize_trials(dut, number_of_cycles, packet_generation_frequency, traffic_generators)
+
+async def run_sweep(dut, sweep, run_point, number_of_lanes=0):
+    # Runs the coarse grid of the sweep, then refines around the saturation knee.
+    # run_point(dut, number_of_cycles, packet_generation_frequency, sweep) returns one CSV row.
+    # number_of_lanes is the lane count of allocator_lanes, 0 for the single allocator.
+    variant = os.getenv("ALLOCATOR_VARIANT", "round_robin")
+    if variant not in sweep.variants:
+        dut._log.info(f"Allocator variant {variant} is not part of sweep {sweep.name}, skipping")
+        return pd.DataFrame()
+
+    rows = {}
+    points = sweep.coarse_points()
+    for refinement_level in range(sweep.max_refinements + 1):
+        for number_of_cycles, packet_generation_frequency in points:
+            row = await run_point(dut, number_of_cycles, packet_generation_frequency, sweep)
+            row["Allocator Variant"] = variant
+            row["Refinement Level"] = refinement_level
+            row["Allocator Lanes"] = number_of_lanes
+            rows[(number_of_cycles, packet_generation_frequency)] = row
+
+        points = sweep.refine_points({point: (row["Drop Rate"], row["Drop Rate Standard Error"]) for point, row in rows.items()})
+        if not points:
+            break
+        dut._log.info(f"Refining {len(points)} points around the saturation knee")
+
+    # Add results to df
+    df = pd.DataFrame([rows[point] for point in sorted(rows)])
+
+    # Save results to CSV
+    df.to_csv(sweep.data_file_name(variant, number_of_lanes), index=False)
+    return df
+
 @cocotb.test()
 async def test_random_traffic(dut):
-    # Initialize inputs
-    df = pd.DataFrame(columns=["Number of Cycles", "Average Dropped Packets", "Ratio of Dropped Packets"])
-
     clock = Clock(dut.clk, 10, units="ns")
     cocotb.start_soon(clock.start())
 
@@ -299,82 +519,46 @@ async def test_random_traffic(dut):
 
     dut._log.info("\n\nStarting random traffic test\n")
 
-    total_iterations = 10
-    
-    start_number_of_cycles = 1000
-    end_number_of_cycles = 10000  # Number of cycles for each iteration
-    number_of_cycle_step_size = 1000
-
-    start_packet_generation_frequency = 0.1  # Probability of generating a packet each cycle
-    end_packet_generation_frequency = 1  # Probability of generating a packet each cycle
-    packet_generation_frequency_step_size = 0.05
-    
-    current_number_of_cycles = start_number_of_cycles
-    current_packet_generation_frequency = start_packet_generation_frequency
-
-    # data_file_name = "data/fairness_random_traffic_results_constant_number_of_cycles.csv"
-    data_file_name = "data/fairness_random_traffic_results_constant_packet_gen_frequency.csv"
-
-    # while current_packet_generation_frequency <= end_packet_generation_frequency:
-    while current_number_of_cycles <= end_number_of_cycles:
-        total_packets_dropped = 0
-        total_0_packets_dropped = 0
-        total_1_packets_dropped = 0
-        total_2_packets_dropped = 0
-        total_3_packets_dropped = 0
-        for iteration in range(total_iterations):
-            traffic_generator = Traffic_Generator(
-                dut,
-                # number_of_cycles=5000,
-                number_of_cycles=current_number_of_cycles,
-                # packet_generation_frequency=current_packet_generation_frequency,
-                packet_generation_frequency=1.0,
-            log=False,
-        )
-            await traffic_generator.process_traffic()
-
-            total_packets_dropped += traffic_generator.allocator_handler.number_of_dropped_packets
-            total_0_packets_dropped += traffic_generator.number_of_0_packets_dropped
-            total_1_packets_dropped += traffic_generator.number_of_1_packets_dropped
-            total_2_packets_dropped += traffic_generator.number_of_2_packets_dropped
-            total_3_packets_dropped += traffic_generator.number_of_3_packets_dropped
-
-            dut._log.info(f"\n\nRandom traffic test completed for iteration {iteration}\n")
-            dut._log.info("Number of dropped packets: %d", traffic_generator.allocator_handler.number_of_dropped_packets)
-
-        average_dropped_packets = total_packets_dropped / total_iterations
-        average_0_packets_dropped = total_0_packets_dropped / total_iterations
-        average_1_packets_dropped = total_1_packets_dropped / total_iterations
-        average_2_packets_dropped = total_2_packets_dropped / total_iterations
-        average_3_packets_dropped = total_3_packets_dropped / total_iterations
-        standard_deviation_dropped_packets = math.sqrt(
-            (average_0_packets_dropped ** 2 + average_1_packets_dropped ** 2 + average_2_packets_dropped ** 2 + average_3_packets_dropped ** 2) / 4
-        )
+    await run_sweep(dut, RANDOM_TRAFFIC_SWEEP, run_sweep_point)
+
+# Single trial compared against the same seed in lane mode by test_allocator_runner.py
+SEED_CHECK_SEED = 7
+SEED_CHECK_CYCLES = 2000
+SEED_CHECK_FREQUENCY = 1.0
+
+def write_drop_counts(traffic_generator):
+    # Writes the drop counts of a trial to $SEED_DROP_COUNTS_FILE, if set
+    drop_counts = {
+        "dropped": traffic_generator.allocator_handler.number_of_dropped_packets,
+        "generated": traffic_generator.total_packets_generated,
+        "per_port": [
+            traffic_generator.number_of_0_packets_dropped,
+            traffic_generator.number_of_1_packets_dropped,
+            traffic_generator.number_of_2_packets_dropped,
+            traffic_generator.number_of_3_packets_dropped,
+        ],
+    }
+    file_name = os.getenv("SEED_DROP_COUNTS_FILE")
+    if file_name:
+        with open(file_name, "w") as f:
+            json.dump(drop_counts, f)
+    return drop_counts
 
-        dut._log.info(f"\n\nCompleted {total_iterations} iterations with {current_number_of_cycles} cycles each.\n")
-        dut._log.info(f"\n\nAverage number of dropped packets per iteration: {average_dropped_packets}\n")
-        dut._log.info(f"Ratio of dropped packets to total cycles: {average_dropped_packets / current_number_of_cycles}\n")
+@cocotb.test()
+async def test_seed_drop_counts(dut):
+    clock = Clock(dut.clk, 10, units="ns")
+    cocotb.start_soon(clock.start())
 
-        # Add results to df
-        new_row = {
-            "Number of Cycles": current_number_of_cycles,
-            "Packet Generation Frequency": current_packet_generation_frequency,
-            "Average Dropped Packets": average_dropped_packets,
-            "Ratio of Dropped Packets to Total Cycles": average_dropped_packets / current_number_of_cycles,
-            "Ratio of Dropped Packets to Packet Generation Frequency": average_dropped_packets / current_packet_generation_frequency,
-            "Total Packets Generated": traffic_generator.total_packets_generated,
-            "Average 0 Packets Dropped": average_0_packets_dropped,
-            "Average 1 Packets Dropped": average_1_packets_dropped,
-            "Average 2 Packets Dropped": average_2_packets_dropped,
-            "Average 3 Packets Dropped": average_3_packets_dropped,
-            "Standard Deviation Dropped Packets": standard_deviation_dropped_packets
-        }
-        df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
+    await Timer(5, units="ns")  # Wait for clock to start
+    await FallingEdge(dut.clk)  # Wait for a falling edge to start
 
-        # reset for next iteration
-        current_number_of_cycles += number_of_cycle_step_size
-        current_packet_generation_frequency += packet_generation_frequency_step_size
-        total_packets_dropped = 0
+    traffic_generator = Traffic_Generator(
+        dut,
+        number_of_cycles=SEED_CHECK_CYCLES,
+        packet_generation_frequency=SEED_CHECK_FREQUENCY,
+        log=False,
+        rng=random.Random(SEED_CHECK_SEED),
+    )
+    await traffic_generator.process_traffic()
 
-    # Save results to CSV
-    df.to_csv(data_file_name, index=False)
\ No newline at end of file
+    dut._log.info("Seed %d drop counts: %s", SEED_CHECK_SEED, write_drop_counts(traffic_generator))
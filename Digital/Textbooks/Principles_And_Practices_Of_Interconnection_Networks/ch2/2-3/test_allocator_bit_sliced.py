@@ -0,0 +1,72 @@
+# test_allocator_bit_sliced.py
+#
+# Cross-checks the bit-sliced model (bit_sliced_allocator.py) against the RTL.
+# One trial of Bit_Sliced_Traffic is driven through the allocator cycle by cycle, the RTL drops
+# are counted by Allocator_Handler as in test_allocator.py and compared per port with
+# Bit_Sliced_Allocator.step. The variant is read from ALLOCATOR_VARIANT and has to match the build.
+# Run through test_allocator_runner.py, or with: make MODULE=test_allocator_bit_sliced
+
+import os
+
+import cocotb
+import numpy as np
+from cocotb.clock import Clock
+from cocotb.triggers import Timer, FallingEdge, RisingEdge
+
+from bit_sliced_allocator import NUMBER_OF_PORTS, Bit_Sliced_Allocator, Bit_Sliced_Traffic
+from test_allocator import HEADER_PHIT_TYPE, Allocator_Handler, Phit
+from test_bit_sliced_allocator import planes_to_inputs, planes_to_ints
+
+CROSS_CHECK_SEED = 0
+CROSS_CHECK_CYCLES = 1000
+CROSS_CHECK_FREQUENCY = 0.5
+# the trial of the model that is driven through the RTL, the other 63 of the word are not compared
+CROSS_CHECK_TRIAL = 0
+
+
+def input_to_phit(value):
+    # r_i -> a phit with the same 4 most significant bits, only the type and the port field survive
+    phit_type = value >> 2
+    if phit_type == HEADER_PHIT_TYPE:
+        return Phit(HEADER_PHIT_TYPE, address=(value & 0b11) << 4)
+    return Phit(phit_type)
+
+
+@cocotb.test()
+async def test_bit_sliced_matches_rtl(dut):
+    variant = os.getenv("ALLOCATOR_VARIANT", "round_robin")
+    clock = Clock(dut.clk, 10, units="ns")
+    cocotb.start_soon(clock.start())
+
+    await Timer(5, units="ns")  # Wait for clock to start
+    await FallingEdge(dut.clk)  # Wait for a falling edge to start
+
+    allocator_handler = Allocator_Handler(log=False)
+    allocator_handler.initialize_allocator(dut)
+    this_port = 0
+    traffic = Bit_Sliced_Traffic(1, CROSS_CHECK_FREQUENCY, np.random.default_rng(CROSS_CHECK_SEED))
+    model = Bit_Sliced_Allocator(1, variant, this_port)
+
+    for cycle in range(CROSS_CHECK_CYCLES):
+        planes = traffic.next_planes()
+        r = planes_to_inputs(planes)[CROSS_CHECK_TRIAL]
+        dut.r0.value, dut.r1.value, dut.r2.value, dut.r3.value = r
+
+        await RisingEdge(dut.clk)
+
+        hold = dut.hold.value
+        rtl_dropped_ports = []
+        for port_number in range(NUMBER_OF_PORTS):
+            allocator_handler.process_lane_interaction(this_port, hold, input_to_phit(r[port_number]), port_number,
+                                                       rtl_dropped_ports.append)
+        rtl_dropped = sum(1 << port_number for port_number in rtl_dropped_ports)
+
+        _, dropped = model.step(planes)
+        model_dropped = planes_to_ints(dropped)[CROSS_CHECK_TRIAL]
+        assert rtl_dropped == model_dropped, \
+            f"cycle {cycle}: RTL dropped ports {rtl_dropped:04b}, model {model_dropped:04b} for r = {r}"
+
+    # a trial without drops would not check anything
+    assert allocator_handler.number_of_dropped_packets > 0
+    dut._log.info("%s: %d drops in %d cycles match the bit-sliced model", variant,
+                  allocator_handler.number_of_dropped_packets, CROSS_CHECK_CYCLES)
@@ -0,0 +1,138 @@
+# test_allocator_lanes.py
+#
+# Runs the random traffic sweep on allocator_lanes.sv, one trial per lane,
+# so a single simulation pass yields LANES trials for about the GPI cost of one.
+# Build with: make ALLOCATOR_LANES=8
+
+import cocotb
+from cocotb.triggers import Timer, FallingEdge, RisingEdge
+from cocotb.clock import Clock
+import random
+
+from test_allocator import (Traffic_Generator, RANDOM_TRAFFIC_SWEEP, run_sweep, summarize_trials,
+                            SEED_CHECK_SEED, SEED_CHECK_CYCLES, SEED_CHECK_FREQUENCY, write_drop_counts)
+
+class Lane_Traffic_Driver:
+    # Drives one Traffic_Generator per lane of allocator_lanes.
+    # Every cycle all lanes are packed into a single write of r,
+    # and hold is read once for all lanes after the clock edge.
+    # A lane whose trial reached steady state is fed null phits and no longer counted,
+    # the pass ends when every lane is done.
+
+    def __init__(self, dut, traffic_generators):
+        self.dut = dut
+        self.traffic_generators = traffic_generators
+        self.number_of_lanes = len(dut.shift)
+        if len(traffic_generators) > self.number_of_lanes:
+            raise ValueError(f"{len(traffic_generators)} trials do not fit in {self.number_of_lanes} lanes")
+        self.initialize_allocator_lanes()
+
+    def initialize_allocator_lanes(self):
+        self.dut.clk.value = 0
+        self.dut.thisPort.value = 0b00  # Set thisPort to 0b00, first port
+        self.dut.r.value = 0
+
+    async def process_traffic(self):
+        number_of_cycles = self.traffic_generators[0].number_of_cycles
+        this_port = int(self.dut.thisPort.value)
+        active = [True] * len(self.traffic_generators)
+        for _ in range(number_of_cycles):
+            if not any(active):
+                break
+            # unused and finished lanes keep null phits
+            r = 0
+            lane_phits = []
+            for lane, traffic_generator in enumerate(self.traffic_generators):
+                if not active[lane]:
+                    lane_phits.append(None)
+                    continue
+                phits = traffic_generator.next_phits()
+                lane_phits.append(phits)
+                packed = (phits[0].allocator_input()
+                          | phits[1].allocator_input() << 4
+                          | phits[2].allocator_input() << 8
+                          | phits[3].allocator_input() << 12)
+                r |= packed << (16 * lane)
+            self.dut.r.value = r
+
+            await RisingEdge(self.dut.clk)
+
+            hold = int(self.dut.hold.value)
+            for lane, traffic_generator in enumerate(self.traffic_generators):
+                if not active[lane]:
+                    continue
+                lane_hold = (hold >> (4 * lane)) & 0b1111
+                for port_number, phit in enumerate(lane_phits[lane]):
+                    traffic_generator.allocator_handler.process_lane_interaction(
+                        this_port, lane_hold, phit, port_number, traffic_generator.add_dropped_packet_to_port_callback
+                    )
+                traffic_generator.debug_cycle_counter += 1
+
+                detector = traffic_generator.steady_state_detector
+                if detector and detector.update(traffic_generator):
+                    active[lane] = False
+
+async def run_sweep_point_lanes(dut, number_of_cycles, packet_generation_frequency, sweep):
+    # Same as run_sweep_point, but the seeds run side by side, one per lane
+    seeds = sweep.seeds
+    number_of_lanes = len(dut.shift)
+    traffic_generators = []
+    for first_seed in range(0, len(seeds), number_of_lanes):
+        lane_seeds = seeds[first_seed:first_seed + number_of_lanes]
+        lane_generators = [
+            Traffic_Generator(
+                None,
+                number_of_cycles=number_of_cycles,
+                packet_generation_frequency=packet_generation_frequency,
+                log=False,
+                rng=random.Random(seed),
+                steady_state_detector=sweep.new_steady_state_detector(),
+            )
+            for seed in lane_seeds
+        ]
+        await Lane_Traffic_Driver(dut, lane_generators).process_traffic()
+        traffic_generators.extend(lane_generators)
+
+        dut._log.info(f"\n\nRandom traffic test completed for seeds {lane_seeds}\n")
+
+    return summarize_trials(dut, number_of_cycles, packet_generation_frequency, traffic_generators)
+
+@cocotb.test()
+async def test_random_traffic_lanes(dut):
+    clock = Clock(dut.clk, 10, units="ns")
+    cocotb.start_soon(clock.start())
+
+    await Timer(5, units="ns")  # Wait for clock to start
+    await FallingEdge(dut.clk)  # Wait for a falling edge to start
+
+    dut._log.info(f"\n\nStarting random traffic test on {len(dut.shift)} allocator lanes\n")
+
+    await run_sweep(dut, RANDOM_TRAFFIC_SWEEP, run_sweep_point_lanes, number_of_lanes=len(dut.shift))
+
+@cocotb.test()
+async def test_seed_drop_counts_lanes(dut):
+    # SEED_CHECK_SEED runs in lane 2 (or the last lane) while the other lanes carry other seeds,
+    # its drop counts must match test_seed_drop_counts on the single allocator
+    clock = Clock(dut.clk, 10, units="ns")
+    cocotb.start_soon(clock.start())
+
+    await Timer(5, units="ns")  # Wait for clock to start
+    await FallingEdge(dut.clk)  # Wait for a falling edge to start
+
+    number_of_lanes = len(dut.shift)
+    check_lane = min(2, number_of_lanes - 1)
+    lane_seeds = [SEED_CHECK_SEED + 1 + lane for lane in range(number_of_lanes)]
+    lane_seeds[check_lane] = SEED_CHECK_SEED
+    lane_generators = [
+        Traffic_Generator(
+            None,
+            number_of_cycles=SEED_CHECK_CYCLES,
+            packet_generation_frequency=SEED_CHECK_FREQUENCY,
+            log=False,
+            rng=random.Random(seed),
+        )
+        for seed in lane_seeds
+    ]
+    await Lane_Traffic_Driver(dut, lane_generators).process_traffic()
+
+    dut._log.info("Seed %d drop counts in lane %d: %s", SEED_CHECK_SEED, check_lane, write_drop_counts(lane_generators[check_lane]))
@@ -0,0 +1,99 @@
+# test_allocator_runner.py
+#
+# Checks that a seed gives the same trial on the single allocator and in allocator_lanes:
+# test_seed_drop_counts (test_allocator.py) and test_seed_drop_counts_lanes
+# (test_allocator_lanes.py) each write the drop counts of SEED_CHECK_SEED to a JSON file.
+# Also runs the cross-check of the bit-sliced model against the RTL (test_allocator_bit_sliced.py).
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cocotb")
+from cocotb.runner import get_runner
+
+from sweep import ALLOCATOR_VARIANTS
+
+SIM = os.getenv("SIM", "icarus")
+LANES = 4
+# verilator needs --timing for the #1 in the initial blocks, its width warnings (the rr_ptr shift) are not errors
+BUILD_ARGS = {"verilator": ["--timing", "-Wno-fatal"]}.get(SIM, [])
+
+SIMULATOR_EXECUTABLES = {"icarus": "iverilog", "verilator": "verilator"}
+pytestmark = pytest.mark.skipif(shutil.which(SIMULATOR_EXECUTABLES.get(SIM, SIM)) is None,
+                                reason=f"{SIM} is not installed")
+
+
+def _run_seed_check(build_dir, sources, hdl_toplevel, test_module, testcase,
+                    drop_counts_file, parameters=None, defines=None):
+    runner = get_runner(SIM)
+    runner.build(
+        sources=sources,
+        hdl_toplevel=hdl_toplevel,
+        build_dir=build_dir,
+        parameters=parameters or {},
+        defines=defines or {},
+        build_args=BUILD_ARGS,
+        always=True,
+    )
+    runner.test(
+        hdl_toplevel=hdl_toplevel,
+        test_module=test_module,
+        testcase=testcase,
+        # no test_dir: the simulator runs in build_dir under tmp_path,
+        # so its results file stays out of the sources
+        build_dir=build_dir,
+        extra_env={"SEED_DROP_COUNTS_FILE": str(drop_counts_file)},
+    )
+    with open(drop_counts_file) as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("variant_source", ["allocator.sv", "initial_allocator.sv"])
+def test_seed_matches_between_sequential_and_lane_mode(tmp_path, monkeypatch, variant_source):
+    proj_path = Path(__file__).resolve().parent
+    # the runner hands sys.path to the simulator as PYTHONPATH, the test modules live next to this file
+    monkeypatch.syspath_prepend(str(proj_path))
+
+    sequential = _run_seed_check(
+        tmp_path / "sim_build_sequential", [proj_path / variant_source],
+        "allocator", "test_allocator", "test_seed_drop_counts",
+        tmp_path / "sequential.json",
+        defines={"ALLOCATOR_NO_DUMP": 1},
+    )
+    lanes = _run_seed_check(
+        tmp_path / "sim_build_lanes", [proj_path / variant_source, proj_path / "allocator_lanes.sv"],
+        "allocator_lanes", "test_allocator_lanes", "test_seed_drop_counts_lanes",
+        tmp_path / "lanes.json",
+        parameters={"LANES": LANES}, defines={"ALLOCATOR_NO_DUMP": 1},
+    )
+
+    assert sequential["generated"] > 0
+    assert lanes == sequential
+
+
+@pytest.mark.parametrize("variant", list(ALLOCATOR_VARIANTS))
+def test_bit_sliced_model_matches_rtl(tmp_path, monkeypatch, variant):
+    proj_path = Path(__file__).resolve().parent
+    monkeypatch.syspath_prepend(str(proj_path))
+    variant_source = ALLOCATOR_VARIANTS[variant][0]
+
+    runner = get_runner(SIM)
+    runner.build(
+        sources=[proj_path / variant_source],
+        hdl_toplevel="allocator",
+        build_dir=tmp_path / "sim_build",
+        defines={"ALLOCATOR_NO_DUMP": 1},
+        build_args=BUILD_ARGS,
+        always=True,
+    )
+    # raises when test_bit_sliced_matches_rtl fails
+    runner.test(
+        hdl_toplevel="allocator",
+        test_module="test_allocator_bit_sliced",
+        build_dir=tmp_path / "sim_build",
+        extra_env={"ALLOCATOR_VARIANT": variant},
+    )
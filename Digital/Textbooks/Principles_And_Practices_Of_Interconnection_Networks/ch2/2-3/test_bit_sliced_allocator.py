@@ -0,0 +1,174 @@
+# test_bit_sliced_allocator.py
+#
+# pytest checks of the bit-sliced allocator model against a scalar model written
+# line by line from allocator.sv (round_robin) and initial_allocator.sv (fixed_priority).
+# The model is checked against the RTL itself in test_allocator_bit_sliced.py.
+
+import numpy as np
+import pytest
+
+from bit_sliced_allocator import (NUMBER_OF_PORTS, TRIALS_PER_WORD, Bit_Sliced_Allocator, Bit_Sliced_Counter,
+                                  Bit_Sliced_Traffic, pack_planes, unpack_planes)
+from sweep import ALLOCATOR_VARIANTS
+
+NUMBER_OF_WORDS = 2
+NUMBER_OF_CYCLES = 200
+
+
+class Scalar_Allocator:
+    # One allocator, every signal a 4 bit int with bit i for port i
+
+    def __init__(self, variant, this_port):
+        self.variant = variant
+        self.this_port = this_port
+        self.last = 0
+        self.rr_ptr = 0
+
+    def step(self, r):
+        # r is [r0, r1, r2, r3], returns (request, dropped)
+        head = sum(((r[i] >> 2) == 3) << i for i in range(NUMBER_OF_PORTS))
+        payload = sum(((r[i] >> 2) == 2) << i for i in range(NUMBER_OF_PORTS))
+        match = sum(((r[i] & 0b11) == self.this_port) << i for i in range(NUMBER_OF_PORTS))
+        request = head & match
+        hold = self.last & payload
+        avail = int(hold == 0)
+
+        if self.variant == "round_robin":
+            doubled_req = request << 4 | request
+            rotated_req = (doubled_req >> self.rr_ptr) & 0b1111
+            rotated_grant = 0
+            for b in range(NUMBER_OF_PORTS):
+                if (rotated_req >> b) & 1:
+                    rotated_grant = 1 << b
+                    break
+            grant = ((rotated_grant << self.rr_ptr) | (rotated_grant >> (4 - self.rr_ptr))) & 0b1111
+        else:
+            pass0 = avail & ~request & 1
+            pass1 = pass0 & ~(request >> 1) & 1
+            pass2 = pass1 & ~(request >> 2) & 1
+            grant = request & (pass2 << 3 | pass1 << 2 | pass0 << 1 | avail)
+
+        select = grant | hold
+        shift = grant != 0
+        self.last = select
+        if self.variant == "round_robin" and shift:
+            self.rr_ptr = (self.rr_ptr + 1) % 4
+
+        # same rule as Allocator_Handler._packet_was_dropped in test_allocator.py
+        dropped = sum(((request >> i) & 1 and hold not in (0, 1 << i)) << i for i in range(NUMBER_OF_PORTS))
+        return request, dropped
+
+
+def planes_to_inputs(planes):
+    # r bit-planes (port, bit, word) -> per trial [r0, r1, r2, r3]
+    bits = unpack_planes(planes).astype(int)
+    values = sum(bits[:, b] << b for b in range(4))
+    return values.T.tolist()
+
+
+def planes_to_ints(planes):
+    # per port planes -> per trial 4 bit int, bit i from port i
+    bits = unpack_planes(np.stack(planes)).astype(int)
+    return sum(bits[i] << i for i in range(NUMBER_OF_PORTS)).tolist()
+
+
+def compare_with_scalar_model(variant, this_port, next_planes):
+    allocator = Bit_Sliced_Allocator(NUMBER_OF_WORDS, variant, this_port)
+    scalar_allocators = [Scalar_Allocator(variant, this_port) for _ in range(NUMBER_OF_WORDS * TRIALS_PER_WORD)]
+    total_dropped = 0
+    for cycle in range(NUMBER_OF_CYCLES):
+        planes = next_planes()
+        request, dropped = allocator.step(planes)
+        expected = [scalar.step(r) for scalar, r in zip(scalar_allocators, planes_to_inputs(planes))]
+        assert planes_to_ints(request) == [request for request, _ in expected], f"request differs in cycle {cycle}"
+        assert planes_to_ints(dropped) == [dropped for _, dropped in expected], f"dropped differs in cycle {cycle}"
+        total_dropped += sum(bin(dropped).count("1") for _, dropped in expected)
+    return total_dropped
+
+
+@pytest.mark.parametrize("this_port", range(4))
+@pytest.mark.parametrize("variant", list(ALLOCATOR_VARIANTS))
+def test_step_matches_scalar_model_on_random_planes(variant, this_port):
+    rng = np.random.default_rng(this_port)
+
+    def random_planes():
+        return rng.integers(0, 1 << 64, (NUMBER_OF_PORTS, 4, NUMBER_OF_WORDS), dtype=np.uint64)
+
+    assert compare_with_scalar_model(variant, this_port, random_planes) > 0
+
+
+@pytest.mark.parametrize("variant", list(ALLOCATOR_VARIANTS))
+def test_step_matches_scalar_model_on_packet_traffic(variant):
+    traffic = Bit_Sliced_Traffic(NUMBER_OF_WORDS, 0.5, np.random.default_rng(0))
+    assert compare_with_scalar_model(variant, 0, traffic.next_planes) > 0
+
+
+def test_counter_counts_every_increment():
+    rng = np.random.default_rng(0)
+    counter = Bit_Sliced_Counter(NUMBER_OF_WORDS, 8)
+    expected = np.zeros(NUMBER_OF_WORDS * TRIALS_PER_WORD, dtype=np.int64)
+    for _ in range(255):
+        increment = rng.random(len(expected)) < 0.7
+        counter.add(pack_planes(increment))
+        expected += increment
+    assert (counter.values() == expected).all()
+
+    full_counter = Bit_Sliced_Counter(NUMBER_OF_WORDS, 8)
+    for _ in range(255):
+        full_counter.add(pack_planes(np.ones(len(expected), dtype=bool)))
+    with pytest.raises(OverflowError):
+        full_counter.add(pack_planes(np.ones(len(expected), dtype=bool)))
+
+
+def decode_packets(packet_generation_frequency, number_of_cycles):
+    # Runs Bit_Sliced_Traffic and decodes every port of every trial back into packets.
+    # Returns (payload phits per packet, headers seen, idle cycles, traffic)
+    traffic = Bit_Sliced_Traffic(NUMBER_OF_WORDS, packet_generation_frequency, np.random.default_rng(1))
+    lengths = []
+    headers = np.zeros((NUMBER_OF_PORTS, NUMBER_OF_WORDS * TRIALS_PER_WORD), dtype=np.int64)
+    idle_cycles = 0
+    # payload phits seen so far in the packet in flight, -1 before the first header
+    in_flight = np.full(headers.shape, -1)
+    for _ in range(number_of_cycles):
+        bits = unpack_planes(traffic.next_planes())
+        phit_type = bits[:, 3].astype(int) << 1 | bits[:, 2]
+        is_header = phit_type == 0b11
+        is_payload = phit_type == 0b10
+        assert not (phit_type == 0b01).any()
+        # a payload phit only follows a header or another payload phit
+        assert (in_flight[is_payload] >= 0).all()
+        # the port field of payload and null phits is 0
+        assert not (bits[:, :2] & ~is_header[:, None]).any()
+
+        # a packet ends at the first phit that is not a payload phit,
+        # a header right after a header shows up as a packet of 0 payload phits
+        ended = (in_flight >= 0) & ~is_payload
+        lengths.extend(in_flight[ended].tolist())
+        in_flight[ended] = -1
+        idle_cycles += int((in_flight < 0).sum()) - int(is_header.sum())
+        in_flight[is_payload] += 1
+        in_flight[is_header] = 0
+        headers += is_header
+    return lengths, headers, idle_cycles, traffic
+
+
+def test_traffic_packets_are_well_formed():
+    lengths, headers, _, traffic = decode_packets(0.3, 300)
+    assert min(lengths) >= 2 and max(lengths) <= 32
+    assert (traffic.packets_generated_values() == headers).all()
+
+
+def test_traffic_matches_traffic_generator_distribution():
+    lengths, headers, idle_cycles, _ = decode_packets(0.3, 1000)
+    # randint(32, 512) // 16 as in Packet
+    expected_mean_length = np.mean(np.arange(32, 513) // 16)
+    assert abs(np.mean(lengths) - expected_mean_length) < 0.3
+    # an idle port starts a packet with probability packet_generation_frequency
+    assert abs(headers.sum() / (headers.sum() + idle_cycles) - 0.3) < 0.01
+
+
+def test_full_load_starts_a_packet_right_after_the_last_one():
+    traffic = Bit_Sliced_Traffic(NUMBER_OF_WORDS, 1.0, np.random.default_rng(0))
+    for _ in range(100):
+        bits = unpack_planes(traffic.next_planes())
+        assert bits[:, 3].all()
@@ -0,0 +1,101 @@
+# test_steady_state.py
+#
+# pytest checks of the steady state detector on synthetic drop sequences.
+
+import random
+
+from steady_state import Steady_State_Detector, mser_truncation
+
+
+class Synthetic_Handler:
+    def __init__(self):
+        self.number_of_dropped_packets = 0
+
+
+class Synthetic_Traffic:
+    # Stands in for Traffic_Generator: every cycle a packet is generated with probability
+    # generation_probability, and dropped with drop_probability(cycle).
+    # All drops are counted on port 0.
+
+    def __init__(self, rng, generation_probability, drop_probability):
+        self.rng = rng
+        self.generation_probability = generation_probability
+        self.drop_probability = drop_probability
+        self.allocator_handler = Synthetic_Handler()
+        self.total_packets_generated = 0
+        self.debug_cycle_counter = 0
+        self.number_of_0_packets_dropped = 0
+        self.number_of_1_packets_dropped = 0
+        self.number_of_2_packets_dropped = 0
+        self.number_of_3_packets_dropped = 0
+
+    def step(self):
+        if self.rng.random() < self.generation_probability:
+            self.total_packets_generated += 1
+            if self.rng.random() < self.drop_probability(self.debug_cycle_counter):
+                self.allocator_handler.number_of_dropped_packets += 1
+                self.number_of_0_packets_dropped += 1
+        self.debug_cycle_counter += 1
+
+    def run(self, detector, number_of_cycles):
+        for _ in range(number_of_cycles):
+            self.step()
+            if detector.update(self):
+                break
+
+
+def transient_then_steady(cycle):
+    # drops twice as often during the first 1000 cycles
+    return 0.3 if cycle < 1000 else 0.15
+
+
+def test_mser_cuts_the_transient():
+    values = [10.0] * 10 + [1.0, 2.0] * 20
+    assert mser_truncation(values) == 10
+
+
+def test_mser_keeps_a_stationary_sequence():
+    values = [1.0, 2.0] * 20
+    assert mser_truncation(values) <= 1
+
+
+def test_transient_is_cut_and_steady_state_rate_measured():
+    for seed in range(10):
+        traffic = Synthetic_Traffic(random.Random(seed), 0.5, transient_then_steady)
+        detector = Steady_State_Detector()
+        traffic.run(detector, 20000)
+
+        assert detector.steady_state_reached, f"seed {seed}: no steady state in 20000 cycles"
+        assert traffic.debug_cycle_counter < 20000
+        assert detector.warmup_cycles >= 500, f"seed {seed}: warm-up of {detector.warmup_cycles} cycles"
+        assert abs(detector.steady_state_drop_rate - 0.15) <= 0.25 * 0.15 + 0.01, \
+            f"seed {seed}: drop rate {detector.steady_state_drop_rate}"
+        assert detector.steady_state_cycles + detector.warmup_cycles == traffic.debug_cycle_counter
+        assert detector.steady_state_port_dropped_packets[0] == detector.steady_state_dropped_packets
+
+
+def test_zero_drops_do_not_stop_low_load_trials_early():
+    # no drop in the first windows says little when only a handful of packets were generated
+    traffic = Synthetic_Traffic(random.Random(0), 0.02, lambda cycle: 0.0)
+    detector = Steady_State_Detector()
+    traffic.run(detector, 5000)
+    assert not detector.steady_state_reached
+
+
+def test_unconverged_trial_is_still_measured_after_its_warm_up():
+    traffic = Synthetic_Traffic(random.Random(0), 0.5, transient_then_steady)
+    detector = Steady_State_Detector(relative_tolerance=0.0, absolute_tolerance=0.0)
+    traffic.run(detector, 4000)
+
+    assert not detector.steady_state_reached
+    assert detector.finish()
+    assert not detector.steady_state_reached
+    assert detector.warmup_cycles >= 500
+    assert detector.steady_state_dropped_packets < traffic.allocator_handler.number_of_dropped_packets
+
+
+def test_short_trial_cannot_be_measured():
+    traffic = Synthetic_Traffic(random.Random(0), 0.5, transient_then_steady)
+    detector = Steady_State_Detector()
+    traffic.run(detector, 1000)
+    assert not detector.finish()
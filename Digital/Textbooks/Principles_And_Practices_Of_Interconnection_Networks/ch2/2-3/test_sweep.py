@@ -0,0 +1,74 @@
+# test_sweep.py
+#
+# pytest checks of the sweep refinement on synthetic drop rate curves.
+
+import random
+
+import pytest
+
+from sweep import Sweep_Spec, find_knee_midpoints, frange
+
+KNEE_FREQUENCY = 0.2
+STANDARD_ERROR = 0.01
+
+
+def knee_curve(frequency):
+    # rises linearly, then saturates flat past the knee
+    return 1.6 * min(frequency, KNEE_FREQUENCY)
+
+
+def refine_until_done(sweep, rng):
+    # runs every refinement round on noisy measurements of knee_curve,
+    # returns all the refined frequencies
+    measurements = {}
+    points = sweep.coarse_points()
+    refined = []
+    for _ in range(sweep.max_refinements + 1):
+        for cycles, frequency in points:
+            measured = knee_curve(frequency) + rng.gauss(0, STANDARD_ERROR)
+            measurements[(cycles, frequency)] = (measured, STANDARD_ERROR)
+        points = sweep.refine_points(measurements)
+        if not points:
+            break
+        refined.extend(frequency for _, frequency in points)
+    return refined
+
+
+def test_refinement_stays_around_the_knee():
+    sweep = Sweep_Spec("test", [1000], frange(0.1, 1.0, 0.1), ["round_robin"], range(10))
+    for seed in range(20):
+        refined = refine_until_done(sweep, random.Random(seed))
+        assert refined, f"seed {seed}: the knee was not refined"
+        assert all(0.1 < frequency < 0.3 for frequency in refined), f"seed {seed}: refined {refined}"
+
+
+def test_flat_noisy_curve_is_not_refined():
+    xs = frange(0.1, 1.0, 0.1)
+    rng = random.Random(0)
+    ys = [0.3 + rng.gauss(0, STANDARD_ERROR) for _ in xs]
+    assert find_knee_midpoints(xs, ys, [STANDARD_ERROR] * len(xs)) == []
+
+
+def test_noiseless_knee_is_halved_on_both_sides():
+    xs = frange(0.1, 1.0, 0.1)
+    ys = [knee_curve(x) for x in xs]
+    assert find_knee_midpoints(xs, ys, [0.0] * len(xs)) == [0.15, 0.25]
+
+
+def test_min_step_stops_refinement():
+    xs = [0.19, 0.2, 0.21]
+    ys = [knee_curve(x) for x in xs]
+    assert find_knee_midpoints(xs, ys, [0.0] * len(xs), min_step=0.01) == []
+
+
+def test_steady_state_batches_must_fit_in_the_min_windows():
+    with pytest.raises(ValueError, match="less than one window per batch"):
+        Sweep_Spec("test", [5000], [0.5], ["round_robin"], [0], steady_state_window_cycles=100,
+                   steady_state_batches=10, steady_state_min_windows=19)
+    with pytest.raises(ValueError, match="at least 2"):
+        Sweep_Spec("test", [5000], [0.5], ["round_robin"], [0], steady_state_window_cycles=100,
+                   steady_state_batches=1, steady_state_min_windows=20)
+
+    sweep = Sweep_Spec("test", [5000], [0.5], ["round_robin"], [0], steady_state_window_cycles=100,
+                       steady_state_batches=10, steady_state_min_windows=20)
+    assert sweep.new_steady_state_detector().min_windows == 20